@@ -1,5 +1,7 @@
-import { spawn, execSync, ChildProcess } from 'child_process';
+import { spawn, execSync, execFile, ChildProcess } from 'child_process';
+import { promisify } from 'util';
 import * as fs from 'fs/promises';
+import type { Dirent } from 'fs';
 import * as path from 'path';
 import * as os from 'os';
 import { randomUUID } from 'crypto';
@@ -52,6 +54,12 @@ export enum AgentStatus {
   STOPPED = 'stopped',
 }
 
+// Persisted status string -> enum member. meta.json stores the lowercase values, which
+// indexing AgentStatus by key ('RUNNING', ...) never matches.
+const AGENT_STATUS_BY_VALUE: ReadonlyMap<string, AgentStatus> = new Map(
+  Object.values(AgentStatus).map((status): [string, AgentStatus] => [status, status])
+);
+
 export type { AgentType } from './parsers.js';
 
 // Base commands for plan mode (read-only, may prompt for confirmation)
@@ -63,6 +71,18 @@ export const AGENT_COMMANDS: Record<AgentType, string[]> = {
   opencode: ['opencode', 'run', '--format', 'json', '{prompt}'],
 };
 
+// Position of the '{prompt}' slot in each command template, found once at load time
+const PROMPT_INDEX = Object.fromEntries(
+  Object.entries(AGENT_COMMANDS).map(([agentType, template]) => [agentType, template.indexOf('{prompt}')])
+) as Record<AgentType, number>;
+
+// Codex takes --model ahead of --sandbox (or right after 'exec'); nothing before that
+// point changes between spawns, so the slot is also found once at load time
+const CODEX_MODEL_INDEX = (() => {
+  const sandboxIndex = AGENT_COMMANDS.codex.indexOf('--sandbox');
+  return sandboxIndex !== -1 ? sandboxIndex : AGENT_COMMANDS.codex.indexOf('exec') + 1;
+})();
+
 // Effort level type
 export type EffortLevel = 'fast' | 'default' | 'detailed';
 export type EffortModelMap = Record<EffortLevel, Record<AgentType, string>>;
@@ -193,12 +213,17 @@ const CLAUDE_PLAN_MODE_PREFIX = `You are running in HEADLESS PLAN MODE. This mod
 `;
 
 const VALID_MODES = ['plan', 'edit', 'ralph'] as const;
-type Mode = typeof VALID_MODES[number];
+export type Mode = typeof VALID_MODES[number];
+const VALID_MODE_SET: ReadonlySet<string> = new Set(VALID_MODES);
 
 function normalizeModeValue(modeValue: string | null | undefined): Mode | null {
   if (!modeValue) return null;
+  // Canonical values (the common case) need no trimming or case folding
+  if (VALID_MODE_SET.has(modeValue)) {
+    return modeValue as Mode;
+  }
   const normalized = modeValue.trim().toLowerCase();
-  if (VALID_MODES.includes(normalized as Mode)) {
+  if (VALID_MODE_SET.has(normalized)) {
     return normalized as Mode;
   }
   return null;
@@ -284,36 +309,133 @@ export function resolveMode(
   return normalizedDefault;
 }
 
+const execFileAsync = promisify(execFile);
+
+function cliNotFoundMessage(executable: string): string {
+  return `CLI tool '${executable}' not found in PATH. Install it first.`;
+}
+
+// Recent `which` results per agent type. Short TTL so a freshly installed CLI is picked up quickly
+// while back-to-back spawns and health checks do not each fork a subprocess.
+const CLI_CHECK_TTL_MS = 30_000;
+const cliCheckCache = new Map<AgentType, { checkedAt: number; result: [boolean, string | null] }>();
+
+function getCachedCliCheck(agentType: AgentType): [boolean, string | null] | null {
+  const cached = cliCheckCache.get(agentType);
+  if (cached && Date.now() - cached.checkedAt < CLI_CHECK_TTL_MS) {
+    return cached.result;
+  }
+  return null;
+}
+
+function setCachedCliCheck(agentType: AgentType, result: [boolean, string | null]): [boolean, string | null] {
+  cliCheckCache.set(agentType, { checkedAt: Date.now(), result });
+  return result;
+}
+
 export function checkCliAvailable(agentType: AgentType): [boolean, string | null] {
   const cmdTemplate = AGENT_COMMANDS[agentType];
   if (!cmdTemplate) {
     return [false, `Unknown agent type: ${agentType}`];
   }
 
+  const cached = getCachedCliCheck(agentType);
+  if (cached) return cached;
+
   const executable = cmdTemplate[0];
   try {
     const whichPath = execSync(`which ${executable}`, { encoding: 'utf-8' }).trim();
-    return [true, whichPath];
+    return setCachedCliCheck(agentType, [true, whichPath]);
   } catch {
-    return [false, `CLI tool '${executable}' not found in PATH. Install it first.`];
+    return setCachedCliCheck(agentType, [false, cliNotFoundMessage(executable)]);
   }
 }
 
-export function checkAllClis(): Record<string, { installed: boolean; path: string | null; error: string | null }> {
-  const results: Record<string, { installed: boolean; path: string | null; error: string | null }> = {};
-  for (const agentType of Object.keys(AGENT_COMMANDS) as AgentType[]) {
-    const [available, pathOrError] = checkCliAvailable(agentType);
+/**
+ * Non-blocking variant of checkCliAvailable for request handlers, so a spawn
+ * does not stall other in-flight tool calls while `which` runs.
+ */
+export async function checkCliAvailableAsync(agentType: AgentType): Promise<[boolean, string | null]> {
+  const cmdTemplate = AGENT_COMMANDS[agentType];
+  if (!cmdTemplate) {
+    return [false, `Unknown agent type: ${agentType}`];
+  }
+
+  const cached = getCachedCliCheck(agentType);
+  if (cached) return cached;
+
+  const executable = cmdTemplate[0];
+  try {
+    const { stdout } = await execFileAsync('which', [executable], { encoding: 'utf-8' });
+    return setCachedCliCheck(agentType, [true, stdout.trim()]);
+  } catch {
+    return setCachedCliCheck(agentType, [false, cliNotFoundMessage(executable)]);
+  }
+}
+
+type CliHealth = Record<string, { installed: boolean; path: string | null; error: string | null }>;
+
+/**
+ * Install status of every supported CLI. The `which` lookups run concurrently
+ * instead of forking one after another on the event loop.
+ */
+export async function checkAllClisAsync(): Promise<CliHealth> {
+  const agentTypes = Object.keys(AGENT_COMMANDS) as AgentType[];
+  const checks = await Promise.all(agentTypes.map(checkCliAvailableAsync));
+  const results: CliHealth = {};
+  agentTypes.forEach((agentType, i) => {
+    const [available, pathOrError] = checks[i];
     if (available) {
       results[agentType] = { installed: true, path: pathOrError, error: null };
     } else {
       results[agentType] = { installed: false, path: null, error: pathOrError };
     }
-  }
+  });
   return results;
 }
 
 let AGENTS_DIR: string | null = null;
 
+// Upper bound on stdout bytes consumed per readNewEvents() call
+const MAX_READ_BYTES = 1024 * 1024;
+
+// Exit codes of agents spawned by this server, keyed by pid and recorded from the child's
+// 'exit' event. Liveness checks for these agents need no signal probe, and reaping reports
+// the real exit code. Agents loaded from disk (spawned by an earlier server) are not listed.
+// Entries are dropped when their agent is removed, so a reused pid never inherits a stale code.
+const childExitCodes: Map<number, number> = new Map();
+
+interface MetaCacheEntry {
+  mtimeNs: bigint;
+  size: bigint;
+  meta: any;
+}
+
+// Parsed meta.json per path, validated against the file's mtime and size. Listing agents
+// reloads every meta file, so unchanged ones cost a stat() instead of read + JSON.parse.
+const META_CACHE_LIMIT = 512;
+const metaCache: Map<string, MetaCacheEntry> = new Map();
+
+/**
+ * Read and parse a meta.json, reusing the previous parse if the file is unchanged.
+ * Throws if the file is missing or not valid JSON.
+ */
+async function readMetaCached(metaPath: string): Promise<any> {
+  const stats = await fs.stat(metaPath, { bigint: true });
+  const cached = metaCache.get(metaPath);
+  if (cached && cached.mtimeNs === stats.mtimeNs && cached.size === stats.size) {
+    return cached.meta;
+  }
+
+  const meta = JSON.parse(await fs.readFile(metaPath, 'utf-8'));
+  metaCache.delete(metaPath);
+  if (metaCache.size >= META_CACHE_LIMIT) {
+    metaCache.delete(metaCache.keys().next().value as string);
+  }
+  metaCache.set(metaPath, { mtimeNs: stats.mtimeNs, size: stats.size, meta });
+  return meta;
+}
+
 export async function getAgentsDir(): Promise<string> {
   if (!AGENTS_DIR) {
     AGENTS_DIR = await resolveAgentsDir();
@@ -321,6 +443,8 @@ export async function getAgentsDir(): Promise<string> {
   return AGENTS_DIR;
 }
 
+// Every field is assigned exactly once in the constructor, in declaration order,
+// so all instances share one object shape and defaults are not stored twice.
 export class AgentProcess {
   agentId: string;
   taskName: string;
@@ -328,15 +452,17 @@ export class AgentProcess {
   prompt: string;
   cwd: string | null;
   workspaceDir: string | null;
-  mode: Mode = 'plan';
-  pid: number | null = null;
-  status: AgentStatus = AgentStatus.RUNNING;
-  startedAt: Date = new Date();
-  completedAt: Date | null = null;
-  parentSessionId: string | null = null;
-  private eventsCache: any[] = [];
-  private lastReadPos: number = 0;
-  private baseDir: string | null = null;
+  mode: Mode;
+  pid: number | null;
+  status: AgentStatus;
+  startedAt: Date;
+  completedAt: Date | null;
+  parentSessionId: string | null;
+  private eventsCache: any[];
+  private lastReadPos: number;
+  private baseDir: string | null;
+  private agentDir: string | null;
+  private stdoutPath: string | null;
 
   constructor(
     agentId: string,
@@ -364,8 +490,12 @@ export class AgentProcess {
     this.status = status;
     this.startedAt = startedAt;
     this.completedAt = completedAt;
-    this.baseDir = baseDir;
     this.parentSessionId = parentSessionId;
+    this.eventsCache = [];
+    this.lastReadPos = 0;
+    this.baseDir = baseDir;
+    this.agentDir = null;
+    this.stdoutPath = null;
   }
 
   get isEditMode(): boolean {
@@ -373,12 +503,19 @@ export class AgentProcess {
   }
 
   async getAgentDir(): Promise<string> {
-    const base = this.baseDir || await getAgentsDir();
-    return path.join(base, this.agentId);
+    // Resolved once per instance; the id and base directory never change after construction
+    if (this.agentDir === null) {
+      const base = this.baseDir || await getAgentsDir();
+      this.agentDir = path.join(base, this.agentId);
+    }
+    return this.agentDir;
   }
 
   async getStdoutPath(): Promise<string> {
-    return path.join(await this.getAgentDir(), 'stdout.log');
+    if (this.stdoutPath === null) {
+      this.stdoutPath = path.join(await this.getAgentDir(), 'stdout.log');
+    }
+    return this.stdoutPath;
   }
 
   async getMetaPath(): Promise<string> {
@@ -451,18 +588,48 @@ export class AgentProcess {
       if (!stats) return;
       const fallbackTimestamp = (stats.mtime || new Date()).toISOString();
 
+      // Only read the bytes appended since the last poll
+      const pending = stats.size - this.lastReadPos;
+      if (pending <= 0) return;
+
+      // The read overwrites the buffer, so skip zero-filling it; only the bytes actually
+      // read are ever looked at
+      const chunk = Buffer.allocUnsafe(Math.min(pending, MAX_READ_BYTES));
       const fd = await fs.open(stdoutPath, 'r');
-      const buffer = Buffer.alloc(1024 * 1024);
-      const { bytesRead } = await fd.read(buffer, 0, buffer.length, this.lastReadPos);
-      await fd.close();
+      let bytesRead: number;
+      try {
+        ({ bytesRead } = await fd.read(chunk, 0, chunk.length, this.lastReadPos));
+      } finally {
+        await fd.close();
+      }
 
       if (bytesRead === 0) return;
+      const buffer = chunk.subarray(0, bytesRead);
+
+      // Consume complete lines only. A trailing partial line is held back when the read stopped
+      // short of the end of the file (the rest of the line is still unread) or while the process
+      // may still be writing it. It is taken as-is only at the real end of a dead process's
+      // output, or when a full chunk contains no line break at all and could never complete.
+      let consumed = buffer.lastIndexOf(0x0a, bytesRead - 1) + 1;
+      if (consumed < bytesRead) {
+        const reachedEnd = bytesRead >= pending;
+        const holdBack = reachedEnd ? this.isProcessAlive() : consumed > 0;
+        if (!holdBack) consumed = bytesRead;
+      }
+      if (consumed === 0) return;
+
+      this.lastReadPos += consumed;
 
-      const newContent = buffer.toString('utf-8', 0, bytesRead);
-      this.lastReadPos += bytesRead;
+      // Walk line boundaries in the raw buffer and decode one line at a time, instead of
+      // decoding the whole chunk and materializing split/trim/filter arrays
+      let lineStart = 0;
+      while (lineStart < consumed) {
+        let lineEnd = buffer.indexOf(0x0a, lineStart);
+        if (lineEnd === -1 || lineEnd > consumed) lineEnd = consumed;
+        const line = buffer.toString('utf-8', lineStart, lineEnd).trim();
+        lineStart = lineEnd + 1;
+        if (!line) continue;
 
-      const lines = newContent.split('\n').map(l => l.trim()).filter(l => l);
-      for (const line of lines) {
         try {
           const rawEvent = JSON.parse(line);
           const events = normalizeEvents(this.agentType, rawEvent);
@@ -496,7 +663,6 @@ export class AgentProcess {
 
   async saveMeta(): Promise<void> {
     const agentDir = await this.getAgentDir();
-    await fs.mkdir(agentDir, { recursive: true });
     const meta = {
       agent_id: this.agentId,
       task_name: this.taskName,
@@ -511,8 +677,26 @@ export class AgentProcess {
       completed_at: this.completedAt?.toISOString() || null,
       parent_session_id: this.parentSessionId,
     };
-    const metaPath = await this.getMetaPath();
-    await fs.writeFile(metaPath, JSON.stringify(meta, null, 2));
+    const metaPath = path.join(agentDir, 'meta.json');
+    // Write to a temp file and rename it into place so readers (including the VS Code
+    // extension) never see a torn meta.json. Compact JSON: it is only read by JSON.parse.
+    const tmpPath = path.join(agentDir, `.meta.${randomUUID().substring(0, 8)}.tmp`);
+    const content = JSON.stringify(meta);
+    metaCache.delete(metaPath);
+    try {
+      try {
+        await fs.writeFile(tmpPath, content);
+      } catch (err: any) {
+        // The agent directory normally exists already; only create it when the write says otherwise
+        if (err?.code !== 'ENOENT') throw err;
+        await fs.mkdir(agentDir, { recursive: true });
+        await fs.writeFile(tmpPath, content);
+      }
+      await fs.rename(tmpPath, metaPath);
+    } catch (err) {
+      await fs.rm(tmpPath, { force: true }).catch(() => {});
+      throw err;
+    }
   }
 
   static async loadFromDisk(agentId: string, baseDir: string | null = null): Promise<AgentProcess | null> {
@@ -521,14 +705,7 @@ export class AgentProcess {
     const metaPath = path.join(agentDir, 'meta.json');
 
     try {
-      await fs.access(metaPath);
-    } catch {
-      return null;
-    }
-
-    try {
-      const metaContent = await fs.readFile(metaPath, 'utf-8');
-      const meta = JSON.parse(metaContent);
+      const meta = await readMetaCached(metaPath);
 
       const agent = new AgentProcess(
         meta.agent_id,
@@ -538,7 +715,7 @@ export class AgentProcess {
         meta.cwd || null,
         meta.mode === 'edit' ? 'edit' : 'plan',
         meta.pid || null,
-        AgentStatus[meta.status as keyof typeof AgentStatus] || AgentStatus.RUNNING,
+        AGENT_STATUS_BY_VALUE.get(meta.status) || AgentStatus.RUNNING,
         new Date(meta.started_at),
         meta.completed_at ? new Date(meta.completed_at) : null,
         baseDir,
@@ -553,6 +730,7 @@ export class AgentProcess {
 
   isProcessAlive(): boolean {
     if (!this.pid) return false;
+    if (childExitCodes.has(this.pid)) return false;
     try {
       process.kill(this.pid, 0);
       return true;
@@ -593,15 +771,45 @@ export class AgentProcess {
     await this.saveMeta();
   }
 
+  /**
+   * Exit status of a process already found dead by isProcessAlive(). Children of this
+   * server report their real code; for others (loaded from disk) no code is
+   * observable, so they count as failed unless their events say otherwise.
+   */
   private async reapProcess(): Promise<number | null> {
     if (!this.pid) return null;
-    try {
-      process.kill(this.pid, 0);
-      return null;
-    } catch {
-      return 1;
+    return childExitCodes.get(this.pid) ?? 1;
+  }
+
+}
+
+// Minimum gap between liveness refreshes of the same agent during spawn's concurrency check
+const SPAWN_REFRESH_INTERVAL_MS = 100;
+
+// stop() gives an agent this long to exit after SIGTERM before escalating to SIGKILL,
+// checking every STOP_POLL_INTERVAL_MS so an agent that exits promptly returns promptly
+const STOP_GRACE_PERIOD_MS = 2000;
+const STOP_POLL_INTERVAL_MS = 100;
+
+/**
+ * The `count` agents that completed first (missing completion times sort first).
+ * Cleanup runs after every spawn, so usually exactly one agent is over the limit;
+ * that case is a single linear scan instead of a full sort.
+ */
+function oldestCompleted(agents: AgentProcess[], count: number): AgentProcess[] {
+  // Read each completion time once rather than inside every comparison
+  const keyed = agents.map((agent): [number, AgentProcess] => [agent.completedAt?.getTime() || 0, agent]);
+
+  if (count === 1) {
+    let oldest = keyed[0];
+    for (const entry of keyed) {
+      if (entry[0] < oldest[0]) oldest = entry;
     }
+    return [oldest[1]];
   }
+
+  keyed.sort((a, b) => a[0] - b[0]);
+  return keyed.slice(0, count).map(([, agent]) => agent);
 }
 
  export class AgentManager {
@@ -617,6 +825,7 @@ export class AgentProcess {
   private constructorAgentConfigs: Record<AgentType, AgentConfig> | null = null;
 
   private constructorAgentsDir: string | null = null;
+  private lastRefreshAt: Map<string, number> = new Map();
 
   constructor(
     maxAgents: number = 50,
@@ -667,28 +876,36 @@ export class AgentProcess {
   }
 
   private async loadExistingAgents(): Promise<void> {
+    // One readdir with file types replaces an access() check plus a stat() per entry
+    let entries: Dirent[];
     try {
-      await fs.access(this.agentsDir);
+      entries = await fs.readdir(this.agentsDir, { withFileTypes: true });
     } catch {
       return;
     }
 
-    const cutoffDate = new Date(Date.now() - this.cleanupAgeDays * 24 * 60 * 60 * 1000);
+    const cutoffMs = Date.now() - this.cleanupAgeDays * 24 * 60 * 60 * 1000;
     let loadedCount = 0;
     let skippedCwd = 0;
     let cleanedOld = 0;
 
-    const entries = await fs.readdir(this.agentsDir);
     for (const entry of entries) {
-      const agentDir = path.join(this.agentsDir, entry);
-      const stat = await fs.stat(agentDir).catch(() => null);
-      if (!stat || !stat.isDirectory()) continue;
+      if (!entry.isDirectory()) {
+        // Symlinked agent directories are followed, as the earlier stat()-based scan did
+        if (!entry.isSymbolicLink()) continue;
+        const target = await fs.stat(path.join(this.agentsDir, entry.name)).catch(() => null);
+        if (!target?.isDirectory()) continue;
+      }
 
-      const agentId = entry;
-      const agent = await AgentProcess.loadFromDisk(agentId, this.agentsDir);
+      const agentId = entry.name;
+      // Agents already tracked keep their instance, and with it the events read so far
+      // and the stdout offset; only directories new to this manager are loaded from disk.
+      const existing = this.agents.get(agentId);
+      const agentDir = path.join(this.agentsDir, agentId);
+      const agent = existing ?? await AgentProcess.loadFromDisk(agentId, this.agentsDir);
       if (!agent) continue;
 
-      if (agent.completedAt && agent.completedAt < cutoffDate) {
+      if (agent.completedAt && agent.completedAt.getTime() < cutoffMs) {
         try {
           await fs.rm(agentDir, { recursive: true });
           cleanedOld++;
@@ -697,6 +914,7 @@ export class AgentProcess {
         }
         continue;
       }
+      if (existing) continue;
 
       if (this.filterByCwd !== null) {
         const agentCwd = agent.cwd;
@@ -730,20 +948,23 @@ export class AgentProcess {
     parentSessionId: string | null = null,
     workspaceDir: string | null = null
   ): Promise<AgentProcess> {
-    await this.initialize();
+    // Validate the mode first; a bad request is rejected without rescanning the agents directory
     const resolvedMode = resolveMode(mode, this.defaultMode);
+    await this.initialize();
 
     // Resolve model from effort level
     const resolvedModel: string = this.effortModelMap[effort][agentType];
 
-    const running = await this.listRunning();
+    // Bursts of spawns reuse liveness checks made moments ago instead of repeating them
+    const running = (await this.refreshRunning(SPAWN_REFRESH_INTERVAL_MS))
+      .filter(a => a.status === AgentStatus.RUNNING);
     if (running.length >= this.maxConcurrent) {
       throw new Error(
         `Maximum concurrent agents (${this.maxConcurrent}) reached. Wait for an agent to complete or stop one first.`
       );
     }
 
-    const [available, pathOrError] = checkCliAvailable(agentType);
+    const [available, pathOrError] = await checkCliAvailableAsync(agentType);
     if (!available) {
       throw new Error(pathOrError || 'CLI tool not available');
     }
@@ -784,7 +1005,7 @@ export class AgentProcess {
     try {
       await fs.mkdir(agentDir, { recursive: true });
     } catch (err: any) {
-      this.agents.delete(agent.agentId);
+      this.removeAgent(agent);
       throw new Error(`Failed to create agent directory: ${err.message}`);
     }
 
@@ -805,6 +1026,13 @@ export class AgentProcess {
       stdoutFile.close().catch(() => {});
 
       agent.pid = childProcess.pid || null;
+      if (childProcess.pid) {
+        const pid = childProcess.pid;
+        childExitCodes.delete(pid);
+        childProcess.once('exit', (code) => {
+          childExitCodes.set(pid, code ?? 1);
+        });
+      }
 
       await agent.saveMeta();
     } catch (err: any) {
@@ -842,7 +1070,11 @@ export class AgentProcess {
       fullPrompt = CLAUDE_PLAN_MODE_PREFIX + fullPrompt;
     }
 
-    let cmd = cmdTemplate.map(part => part.replace('{prompt}', fullPrompt));
+    // Drop the prompt into its precomputed slot. Besides skipping a scan of every part,
+    // this keeps '$&'-style sequences in the prompt literal, which String.replace would expand.
+    const promptIndex = PROMPT_INDEX[agentType];
+    const cmd = cmdTemplate.slice();
+    cmd[promptIndex] = fullPrompt;
 
     // For Claude agents, load user's settings.json to inherit permissions
     // and grant access to the working directory
@@ -857,88 +1089,75 @@ export class AgentProcess {
 
     // Add model flag for each agent type
     if (agentType === 'codex') {
-      const execIndex = cmd.indexOf('exec');
-      const sandboxIndex = cmd.indexOf('--sandbox');
-      const insertIndex = sandboxIndex !== -1 ? sandboxIndex : execIndex + 1;
-      cmd.splice(insertIndex, 0, '--model', model);
+      cmd.splice(CODEX_MODEL_INDEX, 0, '--model', model);
     } else if (agentType === 'cursor') {
       cmd.push('--model', model);
     } else if (agentType === 'gemini' || agentType === 'claude') {
       cmd.push('--model', model);
     } else if (agentType === 'opencode') {
       const opencodeAgent = mode === 'edit' || mode === 'ralph' ? 'build' : 'plan';
-      // Insert --agent flag after the prompt
-      const promptIndex = cmd.indexOf(fullPrompt);
-      if (promptIndex !== -1) {
-        cmd.splice(promptIndex + 1, 0, '--agent', opencodeAgent);
-      }
+      // Insert --agent flag after the prompt (nothing is inserted before it for opencode)
+      cmd.splice(promptIndex + 1, 0, '--agent', opencodeAgent);
       cmd.push('--model', model);
     }
 
+    // cmd is already a private copy of the template, so the mode flags are applied in place
     if (mode === 'ralph') {
-      cmd = this.applyRalphMode(agentType, cmd);
+      this.applyRalphMode(agentType, cmd);
     } else if (isEditMode) {
-      cmd = this.applyEditMode(agentType, cmd);
+      this.applyEditMode(agentType, cmd);
     }
 
     return cmd;
   }
 
-  private applyEditMode(agentType: AgentType, cmd: string[]): string[] {
-    const editCmd: string[] = [...cmd];
-
+  private applyEditMode(agentType: AgentType, cmd: string[]): void {
     switch (agentType) {
       case 'codex':
-        editCmd.push('--full-auto');
+        cmd.push('--full-auto');
         break;
 
       case 'cursor':
-        editCmd.push('-f');
+        cmd.push('-f');
         break;
 
       case 'gemini':
         // Gemini CLI uses --yolo flag for auto-approve
-        editCmd.push('--yolo');
+        cmd.push('--yolo');
         break;
 
       case 'claude':
-        const permModeIndex = editCmd.indexOf('--permission-mode');
-        if (permModeIndex !== -1 && permModeIndex + 1 < editCmd.length) {
-          editCmd[permModeIndex + 1] = 'acceptEdits';
+        const permModeIndex = cmd.indexOf('--permission-mode');
+        if (permModeIndex !== -1 && permModeIndex + 1 < cmd.length) {
+          cmd[permModeIndex + 1] = 'acceptEdits';
         }
         break;
     }
-
-    return editCmd;
   }
 
-  private applyRalphMode(agentType: AgentType, cmd: string[]): string[] {
-    const ralphCmd: string[] = [...cmd];
-
+  private applyRalphMode(agentType: AgentType, cmd: string[]): void {
     switch (agentType) {
       case 'codex':
-        ralphCmd.push('--full-auto');
+        cmd.push('--full-auto');
         break;
 
       case 'cursor':
-        ralphCmd.push('-f');
+        cmd.push('-f');
         break;
 
       case 'gemini':
-        ralphCmd.push('--yolo');
+        cmd.push('--yolo');
         break;
 
       case 'claude':
         // Replace --permission-mode plan with --dangerously-skip-permissions
-        const permModeIndex = ralphCmd.indexOf('--permission-mode');
+        const permModeIndex = cmd.indexOf('--permission-mode');
         if (permModeIndex !== -1) {
-          ralphCmd.splice(permModeIndex, 2); // Remove --permission-mode and its value
+          cmd.splice(permModeIndex, 2); // Remove --permission-mode and its value
         }
-        ralphCmd.push('--dangerously-skip-permissions');
+        cmd.push('--dangerously-skip-permissions');
         break;
     }
-
-    return ralphCmd;
   }
 
   async get(agentId: string): Promise<AgentProcess | null> {
@@ -970,13 +1189,34 @@ export class AgentProcess {
     return agents;
   }
 
+  /**
+   * Refresh only agents still marked running. Finished statuses are terminal, so
+   * classifying agents by status never requires re-reading the ones already done.
+   * Agents refreshed less than `minIntervalMs` ago are taken as-is.
+   */
+  private async refreshRunning(minIntervalMs: number = 0): Promise<AgentProcess[]> {
+    const agents = Array.from(this.agents.values());
+    for (const agent of agents) {
+      if (agent.status !== AgentStatus.RUNNING) continue;
+
+      const now = performance.now();
+      const last = this.lastRefreshAt.get(agent.agentId);
+      if (last !== undefined && now - last < minIntervalMs) continue;
+
+      await agent.readNewEvents();
+      await agent.updateStatusFromProcess();
+      this.lastRefreshAt.set(agent.agentId, now);
+    }
+    return agents;
+  }
+
   async listRunning(): Promise<AgentProcess[]> {
-    const all = await this.listAll();
+    const all = await this.refreshRunning();
     return all.filter(a => a.status === AgentStatus.RUNNING);
   }
 
   async listCompleted(): Promise<AgentProcess[]> {
-    const all = await this.listAll();
+    const all = await this.refreshRunning();
     return all.filter(a => a.status !== AgentStatus.RUNNING);
   }
 
@@ -995,16 +1235,17 @@ export class AgentProcess {
     const stopped: string[] = [];
     const alreadyStopped: string[] = [];
 
-    for (const agent of agents) {
-      if (agent.status === AgentStatus.RUNNING) {
-        const success = await this.stop(agent.agentId);
-        if (success) {
-          stopped.push(agent.agentId);
-        }
-      } else {
+    // Stop running agents concurrently so their SIGTERM grace periods overlap instead of adding up
+    const results = await Promise.all(
+      agents.map(agent => agent.status === AgentStatus.RUNNING ? this.stop(agent.agentId) : null)
+    );
+    agents.forEach((agent, i) => {
+      if (results[i] === null) {
         alreadyStopped.push(agent.agentId);
+      } else if (results[i]) {
+        stopped.push(agent.agentId);
       }
-    }
+    });
 
     return { stopped, alreadyStopped };
   }
@@ -1018,10 +1259,13 @@ export class AgentProcess {
 
     if (agent.pid && agent.status === AgentStatus.RUNNING) {
       try {
+        // Agents are spawned detached, so the pid is also the process group id
         process.kill(-agent.pid, 'SIGTERM');
         console.error(`Sent SIGTERM to agent ${agentId} (PID ${agent.pid})`);
 
-        await new Promise(resolve => setTimeout(resolve, 2000));
+        for (let waited = 0; waited < STOP_GRACE_PERIOD_MS && agent.isProcessAlive(); waited += STOP_POLL_INTERVAL_MS) {
+          await new Promise(resolve => setTimeout(resolve, STOP_POLL_INTERVAL_MS));
+        }
         if (agent.isProcessAlive()) {
           process.kill(-agent.pid, 'SIGKILL');
           console.error(`Sent SIGKILL to agent ${agentId}`);
@@ -1039,8 +1283,23 @@ export class AgentProcess {
     return false;
   }
 
-  private async cleanupPartialAgent(agent: AgentProcess): Promise<void> {
+  /** Drop an agent and its per-agent bookkeeping from this manager. */
+  private removeAgent(agent: AgentProcess): void {
     this.agents.delete(agent.agentId);
+    this.lastRefreshAt.delete(agent.agentId);
+    if (agent.pid) childExitCodes.delete(agent.pid);
+  }
+
+  private async cleanupPartialAgent(agent: AgentProcess): Promise<void> {
+    this.removeAgent(agent);
+    // Spawn may have started the process before failing (e.g. saving meta.json); without
+    // meta it could never be listed or stopped, so take down its process group too
+    if (agent.pid) {
+      try {
+        process.kill(-agent.pid, 'SIGTERM');
+      } catch {
+      }
+    }
     try {
       const agentDir = await agent.getAgentDir();
       await fs.rm(agentDir, { recursive: true });
@@ -1052,13 +1311,8 @@ export class AgentProcess {
   private async cleanupOldAgents(): Promise<void> {
     const completed = await this.listCompleted();
     if (completed.length > this.maxAgents) {
-      completed.sort((a, b) => {
-        const aTime = a.completedAt?.getTime() || 0;
-        const bTime = b.completedAt?.getTime() || 0;
-        return aTime - bTime;
-      });
-      for (const agent of completed.slice(0, completed.length - this.maxAgents)) {
-        this.agents.delete(agent.agentId);
+      for (const agent of oldestCompleted(completed, completed.length - this.maxAgents)) {
+        this.removeAgent(agent);
         try {
           const agentDir = await agent.getAgentDir();
           await fs.rm(agentDir, { recursive: true });
@@ -9,6 +9,7 @@ import { AgentManager, AgentStatus, resolveMode } from './agents.js';
 import { AgentType } from './parsers.js';
 import { getDelta } from './summarizer.js';
 import { readConfig } from './persistence.js';
+import { resolveRalphCwd, getRalphConfig, buildRalphPrompt } from './ralph.js';
 
 /**
  * Truncate a bash command for status output.
@@ -80,13 +81,32 @@ export interface TasksResult {
   tasks: TaskInfo[];
 }
 
+type StatusCounts = Record<AgentStatus, number>;
+
+function emptyStatusCounts(): StatusCounts {
+  return { running: 0, completed: 0, failed: 0, stopped: 0 };
+}
+
+// Status values double as StatusCounts keys, so counting is a single keyed increment
+function countStatus(counts: StatusCounts, status: AgentStatus): void {
+  if (status in counts) counts[status]++;
+}
+
+interface TaskAggregate {
+  agentCount: number;
+  counts: StatusCounts;
+  earliestStartMs: number;
+  latestActivityMs: number;
+  workspaceDir: string | null;
+}
+
 export async function handleSpawn(
   manager: AgentManager,
   taskName: string,
   agentType: AgentType,
   prompt: string,
-  cwd: string | null,
-  mode: string | null,
+  cwd: string | null = null,
+  mode: string | null = null,
   effort: 'fast' | 'default' | 'detailed' | null = 'default',
   parentSessionId: string | null = null,
   workspaceDir: string | null = null
@@ -101,19 +121,7 @@ export async function handleSpawn(
 
   // Ralph mode special handling
   if (resolvedMode === 'ralph') {
-    if (!cwd) {
-      throw new Error('Ralph mode requires a cwd parameter');
-    }
-
-    // Import ralph utilities
-    const { isDangerousPath, getRalphConfig, buildRalphPrompt } = await import('./ralph.js');
-
-    const resolvedCwd = path.resolve(cwd);
-
-    // Safety check
-    if (isDangerousPath(resolvedCwd)) {
-      throw new Error('⚠️ Ralph mode in home or system directory is risky. Use a project directory.');
-    }
+    const resolvedCwd = resolveRalphCwd(cwd);
 
     // Check RALPH.md exists
     const ralphConfig = getRalphConfig();
@@ -201,26 +209,22 @@ export async function handleStatus(
     ? await manager.listByParentSession(normalizedParentSessionId)
     : await manager.listByTask(normalizedTaskName);
 
-  // Filter agents by status ('all' shows everything)
-  const agents = effectiveFilter === 'all'
-    ? allAgents
-    : allAgents.filter((a) => a.status === effectiveFilter);
-
-  const agentStatuses: AgentStatusDetail[] = [];
-  const counts = { running: 0, completed: 0, failed: 0, stopped: 0 };
+  const agents: typeof allAgents = [];
+  const counts = emptyStatusCounts();
 
-  // Count ALL agents for summary (not just filtered)
+  // Single pass: count ALL agents for summary, keep only those matching the filter ('all' keeps everything)
   for (const agent of allAgents) {
-    if (agent.status === AgentStatus.RUNNING) counts.running++;
-    else if (agent.status === AgentStatus.COMPLETED) counts.completed++;
-    else if (agent.status === AgentStatus.FAILED) counts.failed++;
-    else if (agent.status === AgentStatus.STOPPED) counts.stopped++;
-  }
+    countStatus(counts, agent.status);
 
-  // Build details only for filtered agents
-  let maxTimestamp = since || new Date(0).toISOString();  // Track max timestamp for cursor
+    if (effectiveFilter === 'all' || agent.status === effectiveFilter) {
+      agents.push(agent);
+    }
+  }
 
-  for (const agent of agents) {
+  // Build details only for filtered agents. Each agent is summarized as soon as its own
+  // stdout read finishes, so CPU work on one agent overlaps I/O still pending for others;
+  // Promise.all keeps the results in the original order.
+  const agentStatuses: AgentStatusDetail[] = await Promise.all(agents.map(async (agent) => {
     await agent.readNewEvents();
     const events = agent.events;
 
@@ -236,11 +240,8 @@ export async function handleStatus(
     // Find latest timestamp from this agent's events
     const latestEvent = events[events.length - 1];
     const agentTimestamp = latestEvent?.timestamp || new Date().toISOString();
-    if (agentTimestamp > maxTimestamp) {
-      maxTimestamp = agentTimestamp;
-    }
 
-    agentStatuses.push({
+    return {
       agent_id: agent.agentId,
       agent_type: agent.agentType,
       status: agent.status,
@@ -254,7 +255,15 @@ export async function handleStatus(
       tool_count: delta.new_tool_count,
       has_errors: delta.new_errors.length > 0,
       cursor: agentTimestamp,  // Return latest timestamp for this agent
-    });
+    };
+  }));
+
+  // Track max timestamp for cursor
+  let maxTimestamp = since || new Date(0).toISOString();
+  for (const status of agentStatuses) {
+    if (status.cursor > maxTimestamp) {
+      maxTimestamp = status.cursor;
+    }
   }
 
   console.error(`[status] ${lookupLabel}: returning ${agents.length}/${allAgents.length} agents (running=${counts.running}, completed=${counts.completed}, failed=${counts.failed}, stopped=${counts.stopped})`);
@@ -275,69 +284,65 @@ export async function handleTasks(
 
   const allAgents = await manager.listAll();
 
-  // Group agents by taskName
-  const taskMap = new Map<string, typeof allAgents>();
+  // Running agents count as active "now"; read the clock once for the whole listing
+  const nowMs = Date.now();
+
+  // Aggregate per task in a single pass over the agents
+  const taskMap = new Map<string, TaskAggregate>();
   for (const agent of allAgents) {
-    const existing = taskMap.get(agent.taskName) || [];
-    existing.push(agent);
-    taskMap.set(agent.taskName, existing);
-  }
+    const startedMs = agent.startedAt.getTime();
+    let task = taskMap.get(agent.taskName);
+    if (!task) {
+      task = {
+        agentCount: 0,
+        counts: emptyStatusCounts(),
+        earliestStartMs: startedMs,
+        latestActivityMs: 0,
+        workspaceDir: null,
+      };
+      taskMap.set(agent.taskName, task);
+    }
+
+    task.agentCount++;
 
-  const tasks: TaskInfo[] = [];
-
-  for (const [taskName, agents] of taskMap) {
-    let running = 0, completed = 0, failed = 0, stopped = 0;
-    let earliestStart: Date | null = null;
-    let latestActivity: Date | null = null;
-    let workspaceDir: string | null = null;
-
-    for (const agent of agents) {
-      // Count by status
-      if (agent.status === AgentStatus.RUNNING) running++;
-      else if (agent.status === AgentStatus.COMPLETED) completed++;
-      else if (agent.status === AgentStatus.FAILED) failed++;
-      else if (agent.status === AgentStatus.STOPPED) stopped++;
-
-      // Track earliest start (created_at)
-      if (!earliestStart || agent.startedAt < earliestStart) {
-        earliestStart = agent.startedAt;
-      }
-
-      // Track latest activity (modified_at)
-      // For running agents, use current time; for others use completedAt or startedAt
-      const activityTime = agent.status === AgentStatus.RUNNING
-        ? new Date()
-        : (agent.completedAt || agent.startedAt);
-      if (!latestActivity || activityTime > latestActivity) {
-        latestActivity = activityTime;
-      }
-
-      // Use first non-null workspaceDir found
-      if (!workspaceDir && agent.workspaceDir) {
-        workspaceDir = agent.workspaceDir;
-      }
+    countStatus(task.counts, agent.status);
+
+    // Track earliest start (created_at)
+    if (startedMs < task.earliestStartMs) {
+      task.earliestStartMs = startedMs;
     }
 
-    tasks.push({
-      task_name: taskName,
-      agent_count: agents.length,
-      running,
-      completed,
-      failed,
-      stopped,
-      workspace_dir: workspaceDir,
-      created_at: earliestStart?.toISOString() || new Date().toISOString(),
-      modified_at: latestActivity?.toISOString() || new Date().toISOString(),
-    });
-  }
+    // Track latest activity (modified_at)
+    // For running agents, use current time; for others use completedAt or startedAt
+    const activityMs = agent.status === AgentStatus.RUNNING
+      ? nowMs
+      : (agent.completedAt?.getTime() ?? startedMs);
+    if (activityMs > task.latestActivityMs) {
+      task.latestActivityMs = activityMs;
+    }
 
-  // Sort by modified_at descending (most recent first)
-  tasks.sort((a, b) => new Date(b.modified_at).getTime() - new Date(a.modified_at).getTime());
+    // Use first non-null workspaceDir found
+    if (!task.workspaceDir && agent.workspaceDir) {
+      task.workspaceDir = agent.workspaceDir;
+    }
+  }
 
-  // Apply limit
-  const limitedTasks = tasks.slice(0, limit);
+  // Sort by latest activity descending (most recent first)
+  const sortedTasks = Array.from(taskMap).sort(
+    ([, a], [, b]) => b.latestActivityMs - a.latestActivityMs
+  );
 
-  console.error(`[tasks] Returning ${limitedTasks.length}/${tasks.length} tasks`);
+  // Apply limit before formatting so only returned tasks pay for ISO string conversion
+  const limitedTasks: TaskInfo[] = sortedTasks.slice(0, limit).map(([taskName, task]) => ({
+    task_name: taskName,
+    agent_count: task.agentCount,
+    ...task.counts,
+    workspace_dir: task.workspaceDir,
+    created_at: new Date(task.earliestStartMs).toISOString(),
+    modified_at: new Date(task.latestActivityMs).toISOString(),
+  }));
+
+  console.error(`[tasks] Returning ${limitedTasks.length}/${taskMap.size} tasks`);
 
   return { tasks: limitedTasks };
 }
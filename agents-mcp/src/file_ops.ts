@@ -1,3 +1,235 @@
+// Anchored on both sides; the body can only end at the matching unescaped
+// quote, so a non-matching command is rejected in linear time.
+const SHELL_WRAPPER_PATTERN = /(?:^|\s)-[lc]+\s+(["'])((?:(?!\1)[^\\]|\\.)*)\1\s*$/;
+
+const CONTROL_OPERATORS = new Set(['|', '||', '&', '&&', ';']);
+const REDIRECT_OPERATORS = new Set(['>', '>>']);
+
+interface ShellToken {
+  value: string;
+  operator: boolean;
+}
+
+/**
+ * Advance past the bodies of pending heredocs, which start at `pos` (just after the newline
+ * that ends the command line). Returns the index of the first character after the last body.
+ */
+function skipHeredocBodies(command: string, pos: number, delimiters: string[]): number {
+  for (const delimiter of delimiters) {
+    while (pos < command.length) {
+      const newline = command.indexOf('\n', pos);
+      const lineEnd = newline === -1 ? command.length : newline;
+      // "<<-" bodies may indent the closing delimiter with tabs
+      const line = command.slice(pos, lineEnd).replace(/^\t+/, '');
+      pos = lineEnd + 1;
+      if (line === delimiter) break;
+    }
+  }
+  return Math.min(pos, command.length);
+}
+
+/**
+ * Index of the ')' closing the '(' at `open`, or the last index if it is never closed.
+ * Quoted parentheses do not count.
+ */
+function skipParenthesized(command: string, open: number): number {
+  let depth = 0;
+  let quote: string | null = null;
+  for (let i = open; i < command.length; i++) {
+    const ch = command[i];
+    if (quote) {
+      if (ch === quote) quote = null;
+      else if (ch === '\\' && quote === '"') i++;
+    } else if (ch === "'" || ch === '"') {
+      quote = ch;
+    } else if (ch === '\\') {
+      i++;
+    } else if (ch === '(') {
+      depth++;
+    } else if (ch === ')' && --depth === 0) {
+      return i;
+    }
+  }
+  return command.length - 1;
+}
+
+/**
+ * Split a command into words and operators in one left-to-right pass.
+ * Quotes and backslash escapes are honoured like a POSIX shell; an unterminated
+ * quote simply runs to the end of the string instead of failing. An unquoted
+ * newline ends the command like ';', and heredoc bodies are skipped.
+ */
+function tokenize(command: string): ShellToken[] {
+  const tokens: ShellToken[] = [];
+  const heredocDelimiters: string[] = [];
+  let word = '';
+  let inWord = false;
+  let quote: string | null = null;
+
+  const flush = () => {
+    if (inWord) {
+      const previous = tokens[tokens.length - 1];
+      if (previous?.operator && previous.value === '<<') {
+        heredocDelimiters.push(word.replace(/^-/, ''));
+      }
+      tokens.push({ value: word, operator: false });
+      word = '';
+      inWord = false;
+    }
+  };
+
+  for (let i = 0; i < command.length; i++) {
+    const ch = command[i];
+
+    if (quote) {
+      if (ch === quote) {
+        quote = null;
+      } else if (ch === '\\' && quote === '"' && i + 1 < command.length) {
+        word += command[++i];
+      } else {
+        word += ch;
+      }
+      continue;
+    }
+
+    if (ch === "'" || ch === '"') {
+      quote = ch;
+      inWord = true;
+    } else if (ch === '\\' && i + 1 < command.length) {
+      word += command[++i];
+      inWord = true;
+    } else if (ch === '\n') {
+      flush();
+      tokens.push({ value: ';', operator: true });
+      if (heredocDelimiters.length > 0) {
+        i = skipHeredocBodies(command, i + 1, heredocDelimiters) - 1;
+        heredocDelimiters.length = 0;
+      }
+    } else if (ch === ' ' || ch === '\t') {
+      flush();
+    } else if ((ch === '<' || ch === '>') && command[i + 1] === '(') {
+      // Process substitution "<(cmd)" / ">(cmd)" is a pipe, not a file; skip it whole
+      flush();
+      i = skipParenthesized(command, i + 1);
+    } else if (ch === '>' || ch === '<' || ch === '|' || ch === '&' || ch === ';') {
+      // "2>" style redirects belong to the operator, not the word.
+      let fd = '';
+      if (ch === '>' && /^\d$/.test(word)) {
+        fd = word === '1' ? '' : word;
+        word = '';
+        inWord = false;
+      }
+      flush();
+      const next = command[i + 1];
+      if ((ch === '>' || ch === '<') && next === '&') {
+        // ">&2", "2>&1", "<&3" and "3>&-" duplicate or close a descriptor: there is no
+        // file target, and the '&' does not end the command. ">&file" is "&>file".
+        i++;
+        if (/[\d-]/.test(command[i + 1] ?? '')) {
+          while (i + 1 < command.length && /[\d-]/.test(command[i + 1])) i++;
+        } else if (ch === '>') {
+          tokens.push({ value: fd + '>', operator: true });
+        } else {
+          tokens.push({ value: '<&', operator: true });
+        }
+      } else if (fd) {
+        tokens.push({ value: fd + '>', operator: true });
+        if (next === '>') i++;
+      } else if (ch === '<' && next === '<' && command[i + 2] === '<') {
+        // Here-string: the following word is input text, not a file
+        tokens.push({ value: '<<<', operator: true });
+        i += 2;
+      } else if (next === ch && ch !== ';') {
+        tokens.push({ value: ch + ch, operator: true });
+        i++;
+      } else if (ch === '&' && next === '>') {
+        // "&>" and "&>>" send both stdout and stderr to the file
+        const append = command[i + 2] === '>';
+        tokens.push({ value: append ? '>>' : '>', operator: true });
+        i += append ? 2 : 1;
+      } else {
+        tokens.push({ value: ch, operator: true });
+      }
+    } else {
+      word += ch;
+      inWord = true;
+    }
+  }
+  flush();
+  return tokens;
+}
+
+function isFlag(arg: string): boolean {
+  return arg.startsWith('-') && arg.length > 1;
+}
+
+function commandName(word: string): string {
+  const slash = word.lastIndexOf('/');
+  return slash === -1 ? word : word.slice(slash + 1);
+}
+
+function firstOperand(args: string[]): string | undefined {
+  return args.find(arg => !isFlag(arg));
+}
+
+/** Operands after flags, treating `-n N` / `-c N` as a flag with a value. */
+function headTailOperands(args: string[]): string[] {
+  const operands: string[] = [];
+  for (let i = 0; i < args.length; i++) {
+    const arg = args[i];
+    if (arg === '-n' || arg === '-c') {
+      i++;
+    } else if (!isFlag(arg)) {
+      operands.push(arg);
+    }
+  }
+  return operands;
+}
+
+function scanSimpleCommand(
+  words: string[],
+  redirects: string[],
+  filesRead: string[],
+  filesWritten: string[],
+  filesDeleted: string[],
+): void {
+  if (words.length === 0) return;
+  const name = commandName(words[0]);
+  const args = words.slice(1);
+
+  switch (name) {
+    case 'cat':
+      filesRead.push(...args.filter(arg => !isFlag(arg)));
+      filesWritten.push(...redirects);
+      break;
+    case 'echo':
+    case 'printf':
+      filesWritten.push(...redirects);
+      break;
+    case 'tee': {
+      const target = firstOperand(args);
+      if (target) filesWritten.push(target);
+      break;
+    }
+    case 'sed': {
+      if (args.some(arg => arg.startsWith('-i'))) {
+        const target = args[args.length - 1];
+        if (target && !isFlag(target)) filesWritten.push(target);
+      } else if (args[0] === '-n' && args.length >= 3) {
+        filesRead.push(args[2]);
+      }
+      break;
+    }
+    case 'head':
+    case 'tail':
+      filesRead.push(...headTailOperands(args));
+      break;
+    case 'rm':
+      filesDeleted.push(...args.filter(arg => !isFlag(arg)));
+      break;
+  }
+}
+
 /**
  * Try to infer file operations (read/write/delete) from a bash command string.
  * Returns three arrays: files read, written, and deleted.
@@ -8,58 +240,44 @@ export function extractFileOpsFromBash(command: string): [string[], string[], st
   const filesDeleted: string[] = [];
 
   let unwrappedCommand = command;
-  const shellWrapperMatch = command.match(/-[lc]+\s+["'](.+)["']$/);
-  if (shellWrapperMatch) {
-    unwrappedCommand = shellWrapperMatch[1];
-  }
-
-  const writePatterns = [
-    /(?:cat|echo|printf)\s+.*?>\s*["']?([^\s"'|;&]+)/,
-    /tee\s+(?:-a\s+)?["']?([^\s"'|;&]+)/,
-    /sed\s+-i[^\s]*\s+.*?["']?([^\s"']+)$/,
-  ];
-
-  for (const pattern of writePatterns) {
-    const matches = unwrappedCommand.matchAll(new RegExp(pattern, 'g'));
-    for (const match of matches) {
-      const path = match[1];
-      if (path && !path.startsWith('-')) {
-        filesWritten.push(path);
-      }
+  if (command.includes('-l') || command.includes('-c')) {
+    const shellWrapperMatch = SHELL_WRAPPER_PATTERN.exec(command);
+    if (shellWrapperMatch) {
+      const [, quote, body] = shellWrapperMatch;
+      // Inside double quotes the outer shell removes the backslash before these characters
+      unwrappedCommand = quote === '"' ? body.replace(/\\(["\\$`])/g, '$1') : body;
     }
   }
 
-  const readPatterns = [
-    /sed\s+-n\s+["'][^"']+["']\s+["']?([^\s"'|;&>]+)/,
-    /(?:head|tail)\s+(?:-\w+\s+)*(?:\d+\s+)?([^\s"'|;&-][^\s"'|;&]*)/,
-    /^cat\s+(?:-[^\s]+\s+)*["']?([^\s"'|;&>]+)["']?(?:\s|$)/,
-    /\|\s*cat\s+["']?([^\s"'|;&>]+)["']?/,
-  ];
-
-  for (const pattern of readPatterns) {
-    const matches = unwrappedCommand.matchAll(new RegExp(pattern, 'g'));
-    for (const match of matches) {
-      const path = match[1];
-      if (path && !path.startsWith('-')) {
-        filesRead.push(path);
+  let words: string[] = [];
+  let redirects: string[] = [];
+  const tokens = tokenize(unwrappedCommand);
+  for (let i = 0; i < tokens.length; i++) {
+    const token = tokens[i];
+    if (!token.operator) {
+      words.push(token.value);
+    } else if (REDIRECT_OPERATORS.has(token.value)) {
+      const target = tokens[i + 1];
+      if (target && !target.operator) {
+        redirects.push(target.value);
+        i++;
       }
-    }
-  }
-
-  const deletePatterns = [
-    /rm\s+(?:-[^\s]+\s+)*["']?([^\s"'|;&]+)["']?/,
-    /rm\s+(?:-[^\s]+\s+)*([^\s"'|;&-][^\s"'|;&]*)/,
-  ];
-
-  for (const pattern of deletePatterns) {
-    const matches = unwrappedCommand.matchAll(new RegExp(pattern, 'g'));
-    for (const match of matches) {
-      const path = match[1];
-      if (path && !path.startsWith('-') && !path.match(/^-[rf]+$/)) {
-        filesDeleted.push(path);
+    } else if (token.value === '<') {
+      const source = tokens[i + 1];
+      if (source && !source.operator) {
+        filesRead.push(source.value);
+        i++;
       }
+    } else if (token.value.endsWith('>') || token.value === '<<' || token.value === '<<<' || token.value === '<&') {
+      // Other descriptors ("2>/dev/null"), heredoc delimiters, here-strings and "<&word" are not files.
+      if (tokens[i + 1] && !tokens[i + 1].operator) i++;
+    } else if (CONTROL_OPERATORS.has(token.value)) {
+      scanSimpleCommand(words, redirects, filesRead, filesWritten, filesDeleted);
+      words = [];
+      redirects = [];
     }
   }
+  scanSimpleCommand(words, redirects, filesRead, filesWritten, filesDeleted);
 
   const unique = (paths: string[]) => Array.from(new Set(paths.filter(Boolean)));
   return [unique(filesRead), unique(filesWritten), unique(filesDeleted)];
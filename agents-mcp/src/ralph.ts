@@ -17,22 +17,26 @@ export function getRalphConfig(): RalphConfig {
   };
 }
 
-export function isDangerousPath(cwd: string): boolean {
-  const dangerousPaths = [
-    os.homedir(),
-    '/',
-    '/System',
-    '/usr',
-    '/bin',
-    '/sbin',
-    '/etc',
-  ];
+// Directories ralph mode refuses to run in, resolved once at load.
+// Each entry is [path, path + separator] so the prefix test needs no per-call concatenation.
+const DANGEROUS_PATHS: [string, string][] = [
+  os.homedir(),
+  '/',
+  '/System',
+  '/usr',
+  '/bin',
+  '/sbin',
+  '/etc',
+].map(dangerousPath => {
+  const normalized = path.resolve(dangerousPath);
+  return [normalized, normalized + path.sep];
+});
 
+export function isDangerousPath(cwd: string): boolean {
   const normalizedCwd = path.resolve(cwd);
 
-  for (const dangerousPath of dangerousPaths) {
-    const normalizedDangerous = path.resolve(dangerousPath);
-    if (normalizedCwd === normalizedDangerous || normalizedCwd.startsWith(normalizedDangerous + path.sep)) {
+  for (const [dangerousPath, dangerousPrefix] of DANGEROUS_PATHS) {
+    if (normalizedCwd === dangerousPath || normalizedCwd.startsWith(dangerousPrefix)) {
       return true;
     }
   }
@@ -40,6 +44,22 @@ export function isDangerousPath(cwd: string): boolean {
   return false;
 }
 
+/**
+ * Resolve the working directory for a ralph-mode spawn, rejecting a missing cwd
+ * or one in the home or a system directory.
+ */
+export function resolveRalphCwd(cwd: string | null): string {
+  if (!cwd) {
+    throw new Error('Ralph mode requires a cwd parameter');
+  }
+
+  const resolvedCwd = path.resolve(cwd);
+  if (isDangerousPath(resolvedCwd)) {
+    throw new Error('⚠️ Ralph mode in home or system directory is risky. Use a project directory.');
+  }
+  return resolvedCwd;
+}
+
 export function buildRalphPrompt(userPrompt: string, ralphFilePath: string): string {
   return `${userPrompt}
 
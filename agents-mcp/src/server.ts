@@ -5,7 +5,7 @@ import {
   InitializeRequestSchema,
   ListToolsRequestSchema,
 } from '@modelcontextprotocol/sdk/types.js';
-import { AgentManager, checkAllClis } from './agents.js';
+import { AgentManager, checkAllClisAsync } from './agents.js';
 import { AgentType } from './parsers.js';
 import { handleSpawn, handleStatus, handleStop, handleTasks } from './api.js';
 import { readConfig, type AgentConfig } from './persistence.js';
@@ -53,10 +53,6 @@ const agentDescriptions: Record<AgentType, string> = {
   opencode: 'Open source coding agent. Provider-agnostic, TUI-focused.',
 };
 
-function withVersionNotice(description: string): string {
-  return description + buildVersionNotice();
-}
-
 function buildSpawnDescription(): string {
   const agentList = enabledAgents
     .map((agent, i) => `${i + 1}. ${agent} - ${agentDescriptions[agent]}`)
@@ -118,12 +114,16 @@ server.setRequestHandler(InitializeRequestSchema, async (request) => {
   };
 });
 
-server.setRequestHandler(ListToolsRequestSchema, async () => {
+// tools/list response. enabledAgents is fixed after startup, so the catalog is only
+// rebuilt when the version notice appended to each description changes.
+let cachedToolList: { notice: string; response: { tools: any[] } } | null = null;
+
+function buildToolList(notice: string): { tools: any[] } {
   return {
     tools: [
       {
         name: TOOL_NAMES.spawn,
-        description: withVersionNotice(buildSpawnDescription()),
+        description: buildSpawnDescription() + notice,
         inputSchema: {
           type: 'object',
           properties: {
@@ -160,14 +160,14 @@ server.setRequestHandler(ListToolsRequestSchema, async () => {
       },
       {
         name: TOOL_NAMES.status,
-        description: withVersionNotice(`Get status of all agents in a task with full details including:
+        description: `Get status of all agents in a task with full details including:
 - Files created/modified/read/deleted (full paths)
 - All bash commands executed
 - Last 3 assistant messages
 
 Use this for polling agent progress.
 
-CURSOR SUPPORT: Send 'since' parameter (ISO timestamp from previous response's 'cursor' field) to get only NEW data since that time. This avoids duplicate data on repeated polls.`),
+CURSOR SUPPORT: Send 'since' parameter (ISO timestamp from previous response's 'cursor' field) to get only NEW data since that time. This avoids duplicate data on repeated polls.` + notice,
         inputSchema: {
           type: 'object',
           properties: {
@@ -194,9 +194,9 @@ CURSOR SUPPORT: Send 'since' parameter (ISO timestamp from previous response's '
       },
       {
         name: TOOL_NAMES.stop,
-        description: withVersionNotice(`Stop agents. Two modes:
+        description: `Stop agents. Two modes:
 - Stop(task_name): Stop ALL agents in the task
-- Stop(task_name, agent_id): Stop ONE specific agent`),
+- Stop(task_name, agent_id): Stop ONE specific agent` + notice,
         inputSchema: {
           type: 'object',
           properties: {
@@ -214,13 +214,13 @@ CURSOR SUPPORT: Send 'since' parameter (ISO timestamp from previous response's '
       },
       {
         name: TOOL_NAMES.tasks,
-        description: withVersionNotice(`List all tasks with their agents and activity details.
+        description: `List all tasks with their agents and activity details.
 
 Returns tasks sorted by most recent activity, with full agent details including:
 - Files created/modified/read/deleted
 - Bash commands executed
 - Last messages from each agent
-- Status and duration`),
+- Status and duration` + notice,
         inputSchema: {
           type: 'object',
           properties: {
@@ -234,88 +234,88 @@ Returns tasks sorted by most recent activity, with full agent details including:
       },
     ],
   };
+}
+
+server.setRequestHandler(ListToolsRequestSchema, async () => {
+  const notice = buildVersionNotice();
+  if (!cachedToolList || cachedToolList.notice !== notice) {
+    cachedToolList = { notice, response: buildToolList(notice) };
+  }
+  return cachedToolList.response;
 });
 
+type ToolArgs = Record<string, unknown> | undefined;
+
+// Tool results are parsed by the MCP client, not read by humans: compact JSON skips
+// the indentation pass and keeps large event payloads (and token counts) smaller.
+function serializeToolResult(value: unknown): string {
+  return JSON.stringify(value);
+}
+
+// Every tool call answers with a single text content block
+function toolTextResult(value: unknown): { content: Array<{ type: 'text'; text: string }> } {
+  return { content: [{ type: 'text', text: serializeToolResult(value) }] };
+}
+
+function requireArgs(args: ToolArgs, toolName: string): Record<string, unknown> {
+  if (!args) {
+    throw new Error(`Missing arguments for ${toolName}`);
+  }
+  return args;
+}
+
+// Tool handlers keyed by lowercased tool name
+const TOOL_HANDLERS = new Map<string, (args: ToolArgs) => Promise<any>>([
+  ['spawn', async (rawArgs) => {
+    const args = requireArgs(rawArgs, 'spawn');
+    const parentSessionId = getParentSessionIdFromEnv();
+    const workspaceDir = getWorkspaceFromEnv();
+    return handleSpawn(
+      manager,
+      args.task_name as string,
+      args.agent_type as AgentType,
+      args.prompt as string,
+      (args.cwd as string) || null,
+      (args.mode as string) || null,
+      (args.effort as 'fast' | 'default' | 'detailed') || 'default',
+      parentSessionId,
+      workspaceDir
+    );
+  }],
+  ['status', async (rawArgs) => {
+    const args = requireArgs(rawArgs, 'status');
+    return handleStatus(
+      manager,
+      (args.task_name as string | undefined) || null,
+      args.filter as string | undefined,
+      args.since as string | undefined,
+      (args.parent_session_id as string | undefined) || null
+    );
+  }],
+  ['stop', async (rawArgs) => {
+    const args = requireArgs(rawArgs, 'stop');
+    return handleStop(
+      manager,
+      args.task_name as string,
+      args.agent_id as string | undefined
+    );
+  }],
+  ['tasks', async (args) => {
+    const limit = args?.limit as number | undefined;
+    return handleTasks(manager, limit || 10);
+  }],
+]);
+
 server.setRequestHandler(CallToolRequestSchema, async (request) => {
   const { name, arguments: args } = request.params;
-  const normalizedName = name.toLowerCase();
+  const handler = TOOL_HANDLERS.get(name.toLowerCase());
 
   try {
-    let result: any;
-
-    if (normalizedName === 'spawn') {
-      if (!args) {
-        throw new Error('Missing arguments for spawn');
-      }
-      const parentSessionId = getParentSessionIdFromEnv();
-      const workspaceDir = getWorkspaceFromEnv();
-      result = await handleSpawn(
-        manager,
-        args.task_name as string,
-        args.agent_type as AgentType,
-        args.prompt as string,
-        (args.cwd as string) || null,
-        (args.mode as string) || null,
-        (args.effort as 'fast' | 'default' | 'detailed') || 'default',
-        parentSessionId,
-        workspaceDir
-      );
-    } else if (normalizedName === 'status') {
-      if (!args) {
-        throw new Error('Missing arguments for status');
-      }
-      result = await handleStatus(
-        manager,
-        (args.task_name as string | undefined) || null,
-        args.filter as string | undefined,
-        args.since as string | undefined,
-        (args.parent_session_id as string | undefined) || null
-      );
-    } else if (normalizedName === 'stop') {
-      if (!args) {
-        throw new Error('Missing arguments for stop');
-      }
-      result = await handleStop(
-        manager,
-        args.task_name as string,
-        args.agent_id as string | undefined
-      );
-    } else if (normalizedName === 'tasks') {
-      const limit = args?.limit as number | undefined;
-      result = await handleTasks(manager, limit || 10);
-    } else {
-      result = { error: `Unknown tool: ${name}` };
-    }
-
-    return {
-      content: [
-        {
-          type: 'text',
-          text: JSON.stringify(result, null, 2),
-        },
-      ],
-    };
+    const result = handler ? await handler(args) : { error: `Unknown tool: ${name}` };
+    return toolTextResult(result);
   } catch (err: any) {
     console.error(`Error in tool ${name}:`, err);
-    const payload = err?.payload;
-    if (payload) {
-      return {
-        content: [
-          {
-            type: 'text',
-            text: JSON.stringify(payload, null, 2),
-          },
-        ],
-      };
-    }
-    return {
-      content: [
-        {
-          type: 'text',
-          text: JSON.stringify({ error: String(err) }, null, 2),
-        },
-      ],
-    };
+    return toolTextResult(err?.payload || { error: String(err) });
   }
 });
 
@@ -324,7 +324,7 @@ export async function runServer(): Promise<void> {
   const config = await readConfig();
   agentConfigs = config.agentConfigs;
   manager.setModelOverrides(agentConfigs);
-  const cliHealth = checkAllClis();
+  const cliHealth = await checkAllClisAsync();
   const installedAgents = Object.entries(cliHealth)
     .filter(([, status]) => status.installed)
     .map(([agent]) => agent as AgentType);
@@ -336,6 +336,7 @@ export async function runServer(): Promise<void> {
   enabledAgents = config.hasConfig
     ? requestedAgents.filter(a => cliHealth[a]?.installed)
     : installedAgents;
+  cachedToolList = null;
 
   console.error('Requested agents:', requestedAgents.join(', '));
   console.error('Enabled agents (installed):', enabledAgents.join(', ') || 'none');
@@ -1,22 +1,23 @@
 import { AgentType } from './parsers.js';
 import { extractFileOpsFromBash } from './file_ops.js';
 
-function extractErrorFromRawEvents(events: any[], maxChars: number = 500): string | null {
-  const errorKeywords = ['error', 'Error', 'ERROR', 'failed', 'Failed', 'FAILED', 'exception', 'Exception'];
-
-  for (let i = events.length - 1; i >= Math.max(0, events.length - 20); i--) {
+// Case-insensitive search avoids lowercasing (and copying) every raw event's content
+const ERROR_KEYWORD_PATTERN = /error|failed|exception/i;
+const RAW_ERROR_TAIL = 20;
+
+function extractErrorFromRawEvents(events: any[], maxChars: number = 500, from: number = 0): string | null {
+  // Walk the last 20 events (at index `from` or later) by index rather than slicing a copy of the tail
+  const stop = Math.max(from, events.length - RAW_ERROR_TAIL);
+  for (let i = events.length - 1; i >= stop; i--) {
     const event = events[i];
     if (event.type === 'raw') {
       const content = event.content || '';
-      if (typeof content === 'string') {
-        const contentLower = content.toLowerCase();
-        if (errorKeywords.some(keyword => contentLower.includes(keyword.toLowerCase()))) {
-          let errorMsg = content.trim();
-          if (errorMsg.length > maxChars) {
-            errorMsg = errorMsg.substring(0, maxChars - 3) + '...';
-          }
-          return errorMsg;
+      if (typeof content === 'string' && ERROR_KEYWORD_PATTERN.test(content)) {
+        let errorMsg = content.trim();
+        if (errorMsg.length > maxChars) {
+          errorMsg = errorMsg.substring(0, maxChars - 3) + '...';
         }
+        return errorMsg;
       }
     }
   }
@@ -48,6 +49,50 @@ export const PRIORITY: Record<string, string[]> = {
   ],
 };
 
+// Event type -> priority level, derived once from PRIORITY so filtering is a single lookup per event
+const PRIORITY_LEVEL_BY_TYPE: Map<string, string> = new Map(
+  Object.entries(PRIORITY).flatMap(([level, types]) => types.map((type): [string, string] => [type, level]))
+);
+
+const PRIORITY_LEVELS: ReadonlySet<string> = new Set(Object.keys(PRIORITY));
+
+function allowedTypesFor(levels: string[]): ReadonlySet<string> {
+  const wanted = new Set(levels);
+  const allowed = new Set<string>();
+  for (const [type, level] of PRIORITY_LEVEL_BY_TYPE) {
+    if (wanted.has(level)) allowed.add(type);
+  }
+  return allowed;
+}
+
+const DEFAULT_ALLOWED_TYPES: ReadonlySet<string> = allowedTypesFor(['critical', 'important']);
+
+// Allowed type sets for non-default level combinations, keyed by the sorted known level names.
+// Unknown levels select nothing and are left out of the key, so the cache holds at most one
+// entry per subset of PRIORITY's levels no matter what callers pass.
+const allowedTypesCache: Map<string, ReadonlySet<string>> = new Map();
+
+function getAllowedTypes(includeLevels: string[]): ReadonlySet<string> {
+  const key = [...new Set(includeLevels)].filter(level => PRIORITY_LEVELS.has(level)).sort().join(',');
+  let allowed = allowedTypesCache.get(key);
+  if (!allowed) {
+    allowed = allowedTypesFor(includeLevels);
+    allowedTypesCache.set(key, allowed);
+  }
+  return allowed;
+}
+
+// Event type groups used by the per-event loops below, built once instead of per event
+const TOOL_EVENT_TYPES: ReadonlySet<string> = new Set(['bash', 'file_write', 'file_read', 'file_create', 'file_delete', 'tool_use']);
+const FILE_EVENT_TYPES: ReadonlySet<string> = new Set(['file_write', 'file_create', 'file_read', 'file_delete']);
+const FILE_CHANGE_TYPES: ReadonlySet<string> = new Set(['file_write', 'file_create', 'file_delete']);
+const BREAKDOWN_EVENT_TYPES: ReadonlySet<string> = new Set(['bash', 'file_write', 'file_read', 'file_create', 'file_delete']);
+const OUTCOME_EVENT_TYPES: ReadonlySet<string> = new Set(['error', 'result']);
+const DELTA_TOOL_CALL_TYPES: ReadonlySet<string> = new Set(['tool_use', 'bash', 'file_write']);
+const LAST_TOOL_TYPES: ReadonlySet<string> = new Set([
+  'tool_use', 'bash', 'file_write', 'file_create', 'file_read', 'file_delete', 'message', 'error', 'result',
+]);
+
 /**
  * Collapse sequential events of the same type into summary entries.
  * Returns a cleaner list of events suitable for output.
@@ -102,19 +147,19 @@ export function collapseEvents(events: any[], maxEvents: number = 20): any[] {
       continue;
     }
 
-    // Keep tool events as-is but truncate large content
-    if (['bash', 'file_write', 'file_read', 'file_create', 'file_delete', 'tool_use'].includes(eventType)) {
-      const cleaned = { ...event };
-      if (cleaned.command && cleaned.command.length > 200) {
-        cleaned.command = cleaned.command.slice(0, 200) + '...';
+    // Keep tool events as-is but truncate large content (copy only when truncating)
+    if (TOOL_EVENT_TYPES.has(eventType)) {
+      if (event.command && event.command.length > 200) {
+        collapsed.push({ ...event, command: event.command.slice(0, 200) + '...' });
+      } else {
+        collapsed.push(event);
       }
-      collapsed.push(cleaned);
       i++;
       continue;
     }
 
     // Keep errors and results
-    if (['error', 'result'].includes(eventType)) {
+    if (OUTCOME_EVENT_TYPES.has(eventType)) {
       collapsed.push(event);
       i++;
       continue;
@@ -141,16 +186,8 @@ export function getToolBreakdown(events: any[]): Record<string, number> {
   for (const event of events) {
     const eventType = event.type || '';
 
-    if (eventType === 'bash') {
-      breakdown['bash'] = (breakdown['bash'] || 0) + 1;
-    } else if (eventType === 'file_write') {
-      breakdown['file_write'] = (breakdown['file_write'] || 0) + 1;
-    } else if (eventType === 'file_read') {
-      breakdown['file_read'] = (breakdown['file_read'] || 0) + 1;
-    } else if (eventType === 'file_create') {
-      breakdown['file_create'] = (breakdown['file_create'] || 0) + 1;
-    } else if (eventType === 'file_delete') {
-      breakdown['file_delete'] = (breakdown['file_delete'] || 0) + 1;
+    if (BREAKDOWN_EVENT_TYPES.has(eventType)) {
+      breakdown[eventType] = (breakdown[eventType] || 0) + 1;
     } else if (eventType === 'tool_use') {
       const tool = event.tool || 'unknown';
       breakdown[tool] = (breakdown[tool] || 0) + 1;
@@ -195,7 +232,7 @@ export function groupAndFlattenEvents(events: any[]): any[] {
       continue;
     }
 
-    if (['file_write', 'file_create', 'file_read', 'file_delete'].includes(eventType)) {
+    if (FILE_EVENT_TYPES.has(eventType)) {
       const path = event.path || '';
       if (!path) {
         i++;
@@ -264,7 +301,7 @@ export function groupAndFlattenEvents(events: any[]): any[] {
       continue;
     }
 
-    if (['error', 'result'].includes(eventType)) {
+    if (OUTCOME_EVENT_TYPES.has(eventType)) {
       const flattened: any = {
         type: eventType,
       };
@@ -282,29 +319,85 @@ export function groupAndFlattenEvents(events: any[]): any[] {
   return grouped;
 }
 
+/**
+ * First `limit` entries of a set in insertion order, without copying the whole set.
+ */
+function takeFirst<T>(values: Set<T>, limit: number): T[] {
+  const result: T[] = [];
+  for (const value of values) {
+    if (result.length >= limit) break;
+    result.push(value);
+  }
+  return result;
+}
+
+function truncateText(text: string | null, maxLen: number): string | null {
+  if (!text) return null;
+  if (text.length <= maxLen) return text;
+  return text.substring(0, maxLen - 3) + '...';
+}
+
+type SummaryField = [string, (summary: AgentSummary) => any];
+
+// Output fields per detail level, in output order, so toDict is one loop with no branching
+const SUMMARY_FIELDS_BY_LEVEL: Record<string, SummaryField[]> = {
+  brief: [
+    ['duration', s => s.duration],
+    ['tool_call_count', s => s.toolCallCount],
+    ['last_activity', s => s.lastActivity],
+    ['files_modified', s => takeFirst(s.filesModified, 5)],
+    ['files_created', s => takeFirst(s.filesCreated, 5)],
+    ['has_errors', s => s.errors.length > 0],
+  ],
+  standard: [
+    ['duration', s => s.duration],
+    ['files_modified', s => Array.from(s.filesModified)],
+    ['files_created', s => Array.from(s.filesCreated)],
+    ['tools_used', s => Array.from(s.toolsUsed)],
+    ['tool_call_count', s => s.toolCallCount],
+    ['errors', s => s.errors.slice(0, 3)],
+    ['final_message', s => truncateText(s.finalMessage, 2000)],
+  ],
+  detailed: [
+    ['duration', s => s.duration],
+    ['files_modified', s => Array.from(s.filesModified)],
+    ['files_created', s => Array.from(s.filesCreated)],
+    ['files_read', s => Array.from(s.filesRead)],
+    ['files_deleted', s => Array.from(s.filesDeleted)],
+    ['tools_used', s => Array.from(s.toolsUsed)],
+    ['tool_call_count', s => s.toolCallCount],
+    ['bash_commands', s => s.bashCommands.slice(-10)],
+    ['errors', s => s.errors],
+    ['warnings', s => s.warnings],
+    ['final_message', s => s.finalMessage],
+    ['event_count', s => s.eventCount],
+    ['last_activity', s => s.lastActivity],
+  ],
+};
+
+// Fields are assigned once in the constructor, in declaration order, so every summary
+// shares one object shape; status polls keep a summary alive per agent.
 export class AgentSummary {
   agentId: string;
   agentType: string;
   status: string;
-  duration: string | null = null;
-
-  filesModified: Set<string> = new Set();
-  filesCreated: Set<string> = new Set();
-  filesRead: Set<string> = new Set();
-  filesDeleted: Set<string> = new Set();
+  duration: string | null;
 
-  toolsUsed: Set<string> = new Set();
-  toolCallCount: number = 0;
-  bashCommands: string[] = [];
+  filesModified: Set<string>;
+  filesCreated: Set<string>;
+  filesRead: Set<string>;
+  filesDeleted: Set<string>;
 
-  errors: string[] = [];
-  warnings: string[] = [];
-  finalMessage: string | null = null;
+  toolsUsed: Set<string>;
+  toolCallCount: number;
+  bashCommands: string[];
 
-  eventCount: number = 0;
-  lastActivity: string | null = null;
+  errors: string[];
+  warnings: string[];
+  finalMessage: string | null;
 
-  eventsCache: any[] = [];
+  eventCount: number;
+  lastActivity: string | null;
 
   constructor(
     agentId: string,
@@ -317,198 +410,259 @@ export class AgentSummary {
     this.agentType = agentType;
     this.status = status;
     this.duration = duration;
+    this.filesModified = new Set();
+    this.filesCreated = new Set();
+    this.filesRead = new Set();
+    this.filesDeleted = new Set();
+    this.toolsUsed = new Set();
+    this.toolCallCount = 0;
+    this.bashCommands = [];
+    this.errors = [];
+    this.warnings = [];
+    this.finalMessage = null;
     this.eventCount = eventCount;
+    this.lastActivity = null;
   }
 
   toDict(detailLevel: 'brief' | 'standard' | 'detailed' = 'standard'): any {
-    const base: any = {
+    const result: any = {
       agent_id: this.agentId,
       agent_type: this.agentType,
       status: this.status,
     };
+    for (const [key, read] of SUMMARY_FIELDS_BY_LEVEL[detailLevel] ?? SUMMARY_FIELDS_BY_LEVEL.detailed) {
+      result[key] = read(this);
+    }
+    return result;
+  }
+}
 
-    if (detailLevel === 'brief') {
-      return {
-        ...base,
-        duration: this.duration,
-        tool_call_count: this.toolCallCount,
-        last_activity: this.lastActivity,
-        files_modified: Array.from(this.filesModified).slice(0, 5),
-        files_created: Array.from(this.filesCreated).slice(0, 5),
-        has_errors: this.errors.length > 0,
-      };
-    } else if (detailLevel === 'standard') {
-      return {
-        ...base,
-        duration: this.duration,
-        files_modified: Array.from(this.filesModified),
-        files_created: Array.from(this.filesCreated),
-        tools_used: Array.from(this.toolsUsed),
-        tool_call_count: this.toolCallCount,
-        errors: this.errors.slice(0, 3),
-        final_message: this.truncate(this.finalMessage, 2000),
-      };
-    } else {
-      return {
-        ...base,
-        duration: this.duration,
-        files_modified: Array.from(this.filesModified),
-        files_created: Array.from(this.filesCreated),
-        files_read: Array.from(this.filesRead),
-        files_deleted: Array.from(this.filesDeleted),
-        tools_used: Array.from(this.toolsUsed),
-        tool_call_count: this.toolCallCount,
-        bash_commands: this.bashCommands.slice(-10),
-        errors: this.errors,
-        warnings: this.warnings,
-        final_message: this.finalMessage,
-        event_count: this.eventCount,
-        last_activity: this.lastActivity,
-      };
+type SummaryEventHandler = (summary: AgentSummary, event: any, getRawError: () => string | null) => void;
+
+const ERROR_EVENT_KEYS = ['message', 'content', 'error', 'error_message', 'details'];
+const ERROR_RESULT_KEYS = ['message', 'error', 'error_message', 'error_details', 'details'];
+
+// Output only ever shows the last 15 commands (deltas) or 10 (detailed), so keep no more
+const MAX_BASH_COMMANDS = 15;
+
+// Status polls re-summarize an agent's whole event log, so the same bash commands are parsed
+// over and over. Remember recent results; the oldest entry is evicted once the cap is hit.
+const BASH_FILE_OPS_CACHE_LIMIT = 1000;
+const bashFileOpsCache: Map<string, [string[], string[], string[]]> = new Map();
+
+function getBashFileOps(command: string): [string[], string[], string[]] {
+  let fileOps = bashFileOpsCache.get(command);
+  if (!fileOps) {
+    fileOps = extractFileOpsFromBash(command);
+    if (bashFileOpsCache.size >= BASH_FILE_OPS_CACHE_LIMIT) {
+      bashFileOpsCache.delete(bashFileOpsCache.keys().next().value as string);
     }
+    bashFileOpsCache.set(command, fileOps);
   }
+  return fileOps;
+}
+
+function fileOpHandler(target: (summary: AgentSummary) => Set<string>): SummaryEventHandler {
+  return (summary, event) => {
+    const path = event.path || '';
+    if (path) {
+      target(summary).add(path);
+      summary.toolCallCount++;
+    }
+  };
+}
 
-  private truncate(text: string | null, maxLen: number): string | null {
-    if (!text) return null;
-    if (text.length <= maxLen) return text;
-    return text.substring(0, maxLen - 3) + '...';
+function recordError(summary: AgentSummary, event: any, keys: string[], getRawError: () => string | null): void {
+  let errorMsg: string | null = null;
+  for (const key of keys) {
+    if (event[key]) {
+      errorMsg = String(event[key]);
+      break;
+    }
+  }
+
+  if (!errorMsg) {
+    errorMsg = getRawError();
+  }
+
+  if (errorMsg) {
+    if (errorMsg.length > 500) {
+      errorMsg = errorMsg.substring(0, 497) + '...';
+    }
+    summary.errors.push(errorMsg);
   }
 }
 
-export function summarizeEvents(
-  agentId: string,
-  agentType: string,
-  status: string,
-  events: any[],
-  duration: string | null = null
-): AgentSummary {
-  const summary = new AgentSummary(agentId, agentType, status, duration, events.length);
-  summary.eventsCache = events;
-  summary.agentId = agentId;
-  summary.agentType = agentType;
-  summary.status = status;
+function formatTenths(tenths: number): string {
+  return `${Math.floor(tenths / 10)}.${tenths % 10}`;
+}
 
-  for (const event of events) {
-    const eventType = event.type || 'unknown';
-    summary.lastActivity = eventType;
+function formatDurationMs(durationMs: number): string {
+  // Integer tenths avoid float formatting and its rounding surprises (e.g. 0.15.toFixed(1))
+  const ms = Math.round(durationMs);
+  if (ms < 60000) {
+    if (ms % 1000 === 0) {
+      return `${ms / 1000} seconds`;
+    }
+    return `${formatTenths(Math.round(ms / 100))} seconds`;
+  }
+  return `${formatTenths(Math.round(ms / 6000))} minutes`;
+}
 
-    if (eventType === 'file_write') {
-      const path = event.path || '';
-      if (path) {
-        summary.filesModified.add(path);
-        summary.toolCallCount++;
+// Event type -> summary update, so each event costs one map lookup instead of walking an if/else ladder
+const SUMMARY_EVENT_HANDLERS: Map<string, SummaryEventHandler> = new Map<string, SummaryEventHandler>([
+  ['file_write', fileOpHandler(summary => summary.filesModified)],
+  ['file_create', fileOpHandler(summary => summary.filesCreated)],
+  ['file_read', fileOpHandler(summary => summary.filesRead)],
+  ['file_delete', fileOpHandler(summary => summary.filesDeleted)],
+  ['directory_list', (summary) => {
+    summary.toolCallCount++;
+  }],
+  ['tool_use', (summary, event) => {
+    summary.toolsUsed.add(event.tool || 'unknown');
+    summary.toolCallCount++;
+  }],
+  ['bash', (summary, event) => {
+    const command = event.command || '';
+    summary.toolsUsed.add('bash');
+    if (command) {
+      summary.bashCommands.push(command);
+      if (summary.bashCommands.length > MAX_BASH_COMMANDS) {
+        summary.bashCommands.shift();
       }
-    } else if (eventType === 'file_create') {
-      const path = event.path || '';
-      if (path) {
-        summary.filesCreated.add(path);
-        summary.toolCallCount++;
-      }
-    } else if (eventType === 'file_read') {
-      const path = event.path || '';
-      if (path) {
+      const [filesRead, filesWritten, filesDeleted] = getBashFileOps(command);
+      for (const path of filesRead) {
         summary.filesRead.add(path);
-        summary.toolCallCount++;
       }
-    } else if (eventType === 'file_delete') {
-      const path = event.path || '';
-      if (path) {
-        summary.filesDeleted.add(path);
-        summary.toolCallCount++;
-      }
-    } else if (eventType === 'directory_list') {
-      summary.toolCallCount++;
-    } else if (eventType === 'tool_use') {
-      const tool = event.tool || 'unknown';
-      summary.toolsUsed.add(tool);
-      summary.toolCallCount++;
-    } else if (eventType === 'bash') {
-      const command = event.command || '';
-      summary.toolsUsed.add('bash');
-      if (command) {
-        summary.bashCommands.push(command);
-        const [filesRead, filesWritten, filesDeleted] = extractFileOpsFromBash(command);
-        for (const path of filesRead) {
-          summary.filesRead.add(path);
-        }
-        for (const path of filesWritten) {
-          summary.filesModified.add(path);
-        }
-        for (const path of filesDeleted) {
-          summary.filesDeleted.add(path);
-        }
-      }
-      summary.toolCallCount++;
-    } else if (eventType === 'message') {
-      const content = event.content || '';
-      if (content) {
-        summary.finalMessage = content;
+      for (const path of filesWritten) {
+        summary.filesModified.add(path);
       }
-    } else if (eventType === 'error') {
-      let errorMsg: string | null = null;
-      for (const key of ['message', 'content', 'error', 'error_message', 'details']) {
-        if (event[key]) {
-          errorMsg = String(event[key]);
-          break;
-        }
+      for (const path of filesDeleted) {
+        summary.filesDeleted.add(path);
       }
+    }
+    summary.toolCallCount++;
+  }],
+  ['error', (summary, event, getRawError) => {
+    recordError(summary, event, ERROR_EVENT_KEYS, getRawError);
+  }],
+  ['warning', (summary, event) => {
+    const warningMsg = event.message || event.content || '';
+    if (warningMsg) {
+      summary.warnings.push(warningMsg);
+    }
+  }],
+  ['result', (summary, event, getRawError) => {
+    if (event.status === 'error') {
+      recordError(summary, event, ERROR_RESULT_KEYS, getRawError);
+    }
+    if (!summary.duration && event.duration_ms) {
+      summary.duration = formatDurationMs(event.duration_ms);
+    }
+  }],
+]);
 
-      if (!errorMsg) {
-        errorMsg = extractErrorFromRawEvents(summary.eventsCache);
-      }
+/**
+ * Summarize an agent's events. Accepts any iterable; non-array inputs are collected
+ * into an array first so every container is summarized by the same code path.
+ */
+export function summarizeEvents(
+  agentId: string,
+  agentType: string,
+  status: string,
+  events: Iterable<any>,
+  duration: string | null = null
+): AgentSummary {
+  const summary = new AgentSummary(agentId, agentType, status, duration);
+  const list = Array.isArray(events) ? events : Array.from(events);
+  applyEvents(summary, list, 0, 0);
+  return summary;
+}
 
-      if (errorMsg) {
-        if (errorMsg.length > 500) {
-          errorMsg = errorMsg.substring(0, 497) + '...';
-        }
-        summary.errors.push(errorMsg);
-      }
-    } else if (eventType === 'warning') {
-      const warningMsg = event.message || event.content || '';
-      if (warningMsg) {
-        summary.warnings.push(warningMsg);
-      }
-    } else if (eventType === 'result') {
-      if (event.status === 'error') {
-        let errorMsg: string | null = null;
-        for (const key of ['message', 'error', 'error_message', 'error_details', 'details']) {
-          if (event[key]) {
-            errorMsg = String(event[key]);
-            break;
-          }
-        }
+/**
+ * Fold `events[batchFrom..]` into an existing summary that already covers
+ * `events[rangeFrom..batchFrom)`. The whole range is only consulted for the raw-event error
+ * fallback. Returns true if that fallback was consulted: the result then depends on the tail
+ * of the range, and folding in further events would not match a full recompute.
+ */
+function applyEvents(summary: AgentSummary, events: any[], batchFrom: number, rangeFrom: number): boolean {
+  // The raw-event error fallback only depends on the tail of the range, so scan it at most once
+  let rawError: string | null | undefined;
+  const getRawError = (): string | null => {
+    if (rawError === undefined) {
+      rawError = extractErrorFromRawEvents(events, 500, rangeFrom);
+    }
+    return rawError;
+  };
 
-        if (!errorMsg) {
-          errorMsg = extractErrorFromRawEvents(summary.eventsCache);
-        }
+  summary.eventCount += events.length - batchFrom;
+  for (let i = batchFrom; i < events.length; i++) {
+    const event = events[i];
+    SUMMARY_EVENT_HANDLERS.get(event.type || 'unknown')?.(summary, event, getRawError);
+  }
 
-        if (errorMsg) {
-          if (errorMsg.length > 500) {
-            errorMsg = errorMsg.substring(0, 497) + '...';
-          }
-          summary.errors.push(errorMsg);
-        }
-      }
-      if (!summary.duration && event.duration_ms) {
-        const durationMs = event.duration_ms;
-        const seconds = durationMs / 1000;
-        if (seconds < 60) {
-          if (seconds % 1 === 0) {
-            summary.duration = `${Math.floor(seconds)} seconds`;
-          } else {
-            summary.duration = `${seconds.toFixed(1)} seconds`;
-          }
-        } else {
-          const minutes = seconds / 60;
-          summary.duration = `${minutes.toFixed(1)} minutes`;
-        }
-      }
+  // Only the latest activity and the last non-empty message matter, so read them from the end
+  if (events.length > batchFrom) {
+    summary.lastActivity = events[events.length - 1].type || 'unknown';
+  }
+  for (let i = events.length - 1; i >= batchFrom; i--) {
+    const event = events[i];
+    if (event.type === 'message' && event.content) {
+      summary.finalMessage = event.content;
+      break;
     }
   }
+  return rawError !== undefined;
+}
 
-  return summary;
+interface DeltaState {
+  agentId: string;
+  agentType: string;
+  since: string | number | undefined;
+  eventCount: number;
+  // The delta covers source[start..]. source is the caller's events array when the selected
+  // events are contiguous, so nothing is copied; otherwise it holds just the selected events.
+  source: any[];
+  start: number;
+  summary: AgentSummary;
+  // Set once an error fell back to the raw-event tail; such summaries are rebuilt, not extended
+  tailDependent: boolean;
+  delta: any;
+}
+
+interface DeltaCacheEntry {
+  // Whether events[0..orderedCount) carry valid, non-decreasing timestamps. Checked once per
+  // event, so a timestamp cursor can binary search for its first new event.
+  orderedCount: number;
+  timestampsSorted: boolean;
+  lastTimestampMs: number;
+  state: DeltaState | null;
+}
+
+// Running delta state per events array. An agent's event list only ever grows, so when it
+// gets longer only the appended events are filtered and folded into the cached summary.
+// Keyed weakly by the array so discarded agents do not pin their events.
+const deltaCache = new WeakMap<any[], DeltaCacheEntry>();
+
+function timestampMs(event: any): number {
+  return event.timestamp ? new Date(event.timestamp).getTime() : NaN;
+}
+
+function updateTimestampOrder(entry: DeltaCacheEntry, events: any[]): void {
+  for (let i = entry.orderedCount; i < events.length && entry.timestampsSorted; i++) {
+    const ms = timestampMs(events[i]);
+    if (!(ms >= entry.lastTimestampMs)) {
+      entry.timestampsSorted = false;
+    }
+    entry.lastTimestampMs = ms;
+  }
+  entry.orderedCount = events.length;
 }
 
+/**
+ * Events and summary fields added since `since`. Results are cached per events array and
+ * shared between callers, so the returned delta is frozen and must be treated as read-only.
+ */
 export function getDelta(
   agentId: string,
   agentType: string,
@@ -516,33 +670,136 @@ export function getDelta(
   events: any[],
   since?: string | number  // Optional: ISO timestamp (string) or event index (number)
 ): any {
-  // Filter events by timestamp (string) or index (number)
-  let newEvents: any[];
-  let sinceEvent = 0;
+  let entry = deltaCache.get(events);
+  if (!entry) {
+    entry = { orderedCount: 0, timestampsSorted: true, lastTimestampMs: -Infinity, state: null };
+    deltaCache.set(events, entry);
+  }
+  updateTimestampOrder(entry, events);
+
+  const cached = entry.state;
+  if (
+    cached &&
+    cached.eventCount <= events.length &&
+    cached.agentId === agentId &&
+    cached.agentType === agentType &&
+    cached.since === since &&
+    !(typeof since === 'number' && since < 0)
+  ) {
+    if (cached.eventCount === events.length && cached.summary.status === status) {
+      return cached.delta;
+    }
+    if (!cached.tailDependent) {
+      const [batchSource, batchStart] = selectNewEvents(events, since, cached.eventCount, entry.timestampsSorted);
+      let batchFrom = -1;
+      if (cached.source !== events) {
+        // Selected events are collected separately; append the new ones
+        batchFrom = cached.source.length;
+        for (let i = batchStart; i < batchSource.length; i++) {
+          cached.source.push(batchSource[i]);
+        }
+      } else if (batchSource === events) {
+        if (cached.start >= cached.eventCount) {
+          // Nothing was selected yet, so the range may begin anywhere in the new events
+          cached.start = batchStart;
+          batchFrom = batchStart;
+        } else if (batchStart === cached.eventCount) {
+          batchFrom = batchStart;
+        }
+      }
+      // Otherwise the selection stopped being contiguous and is rebuilt below
+      if (batchFrom !== -1) {
+        cached.summary.status = status;
+        cached.tailDependent = applyEvents(cached.summary, cached.source, batchFrom, cached.start);
+        cached.eventCount = events.length;
+        cached.delta = buildDelta(cached.summary, cached.source, cached.start, since);
+        return cached.delta;
+      }
+    }
+  }
 
+  const [source, start] = selectNewEvents(events, since, 0, entry.timestampsSorted);
+  const summary = new AgentSummary(agentId, agentType, status);
+  const tailDependent = applyEvents(summary, source, start, start);
+  const delta = buildDelta(summary, source, start, since);
+  entry.state = {
+    agentId,
+    agentType,
+    since,
+    eventCount: events.length,
+    source,
+    start,
+    summary,
+    tailDependent,
+    delta,
+  };
+  return delta;
+}
+
+/**
+ * Events at index `from` or later that fall after `since`, as `[source, start]`: the
+ * selection is `source[start..]`. Contiguous selections point into `events` itself; a
+ * timestamp filter over out-of-order events collects its matches into a new array.
+ */
+function selectNewEvents(
+  events: any[],
+  since: string | number | undefined,
+  from: number,
+  timestampsSorted: boolean
+): [any[], number] {
   if (since === undefined || since === null) {
     // No filter - return all events
-    newEvents = events;
-  } else if (typeof since === 'number') {
+    return [events, from];
+  }
+  if (typeof since === 'number') {
     // Backward compatibility: event index
-    sinceEvent = since;
-    newEvents = events.slice(sinceEvent);
-  } else if (typeof since === 'string') {
+    return [events, since < 0 ? Math.max(0, events.length + since) : Math.min(events.length, Math.max(since, from))];
+  }
+  if (typeof since === 'string') {
     // New behavior: timestamp filtering
-    const sinceDate = new Date(since);
-    newEvents = events.filter((e: any) => {
-      if (!e.timestamp) return false;
-      const eventDate = new Date(e.timestamp);
-      return eventDate > sinceDate;
-    });
-  } else {
-    newEvents = events;
+    const sinceMs = new Date(since).getTime();
+    if (timestampsSorted) {
+      // Every later event is at least as new, so binary search for the first one after `since`
+      let lo = from;
+      let hi = events.length;
+      while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (timestampMs(events[mid]) > sinceMs) {
+          hi = mid;
+        } else {
+          lo = mid + 1;
+        }
+      }
+      return [events, lo];
+    }
+    const selected: any[] = [];
+    for (let i = from; i < events.length; i++) {
+      if (timestampMs(events[i]) > sinceMs) {
+        selected.push(events[i]);
+      }
+    }
+    return [selected, 0];
   }
+  return [events, from];
+}
 
-  if (newEvents.length === 0) {
-    return {
-      agent_id: agentId,
-      status: status,
+// Deltas are cached and handed to every caller, so they and their lists are frozen
+function freezeDelta(delta: any): any {
+  for (const value of Object.values(delta)) {
+    if (Array.isArray(value)) Object.freeze(value);
+  }
+  return Object.freeze(delta);
+}
+
+/** Delta for `summary`, which covers the new events `events[from..]`. */
+function buildDelta(summary: AgentSummary, events: any[], from: number, since?: string | number): any {
+  const sinceEvent = typeof since === 'number' ? since : 0;
+  const newEventCount = events.length - from;
+
+  if (newEventCount === 0) {
+    return freezeDelta({
+      agent_id: summary.agentId,
+      status: summary.status,
       since_event: sinceEvent,  // For backward compatibility
       new_events_count: 0,
       has_changes: false,
@@ -554,52 +811,47 @@ export function getDelta(
       new_messages: [],
       new_tool_count: 0,
       new_errors: [],
-    };
+    });
   }
 
-  const summary = summarizeEvents(agentId, agentType, status, newEvents);
-
-  return {
-    agent_id: agentId,
-    agent_type: agentType,
-    status: status,
+  return freezeDelta({
+    agent_id: summary.agentId,
+    agent_type: summary.agentType,
+    status: summary.status,
     since_event: sinceEvent,  // For backward compatibility
-    new_events_count: newEvents.length,
-    current_event_count: sinceEvent + newEvents.length,  // For backward compatibility
+    new_events_count: newEventCount,
+    current_event_count: sinceEvent + newEventCount,  // For backward compatibility
     has_changes: true,
     new_files_created: Array.from(summary.filesCreated),
     new_files_modified: Array.from(summary.filesModified),
     new_files_read: Array.from(summary.filesRead),
     new_files_deleted: Array.from(summary.filesDeleted),
     new_bash_commands: summary.bashCommands.slice(-15),
-    new_messages: getLastMessages(newEvents, 5),
+    new_messages: getLastMessages(events, 5, from),
     new_tool_count: summary.toolCallCount,
-    new_tool_calls: newEvents  // For backward compatibility
-      .filter((e: any) => ['tool_use', 'bash', 'file_write'].includes(e.type))
-      .slice(-5)
-      .map((e: any) => `${e.tool || 'unknown'}: ${e.command || e.path || ''}`),
+    new_tool_calls: getLastToolCalls(events, 5, from),  // For backward compatibility
     latest_message: summary.finalMessage,  // For backward compatibility
-    new_errors: summary.errors,
-  };
+    new_errors: summary.errors.slice(),
+  });
+}
+
+function getLastToolCalls(events: any[], count: number, from: number = 0): string[] {
+  const calls: string[] = [];
+  for (let i = events.length - 1; i >= from && calls.length < count; i--) {
+    const e = events[i];
+    if (DELTA_TOOL_CALL_TYPES.has(e.type)) {
+      calls.push(`${e.tool || 'unknown'}: ${e.command || e.path || ''}`);
+    }
+  }
+  return calls.reverse();
 }
 
 export function filterEventsByPriority(
   events: any[],
   includeLevels: string[] | null = null
 ): any[] {
-  if (!includeLevels) {
-    includeLevels = ['critical', 'important'];
-  }
-
-  const allowedTypes = new Set<string>();
-  for (const level of includeLevels) {
-    const types = PRIORITY[level] || [];
-    for (const type of types) {
-      allowedTypes.add(type);
-    }
-  }
-
-  return events.filter(e => allowedTypes.has(e.type));
+  const allowed = includeLevels ? getAllowedTypes(includeLevels) : DEFAULT_ALLOWED_TYPES;
+  return events.filter(e => allowed.has(e.type));
 }
 
 export function getLastTool(events: any[]): string | null {
@@ -608,8 +860,7 @@ export function getLastTool(events: any[]): string | null {
   const lastEvent = events[events.length - 1];
   const eventType = lastEvent.type || '';
 
-  const validTypes = ['tool_use', 'bash', 'file_write', 'file_create', 'file_read', 'file_delete', 'message', 'error', 'result'];
-  if (validTypes.includes(eventType)) {
+  if (LAST_TOOL_TYPES.has(eventType)) {
     return eventType;
   }
 
@@ -644,45 +895,36 @@ export function getToolUses(events: any[]): Array<{tool: string, args: any}> {
   return toolUses;
 }
 
-export function getLastMessages(events: any[], count: number = 3): string[] {
+export function getLastMessages(events: any[], count: number = 3, from: number = 0): string[] {
+  // Walk backwards so only the last `count` messages are assembled. A message is a run of
+  // consecutive message events; streaming fragments are joined without newlines because they
+  // are likely parts of the same sentence/block, and a `complete` event closes its run.
+  const limit = count > 0 ? count : Infinity;
   const messages: string[] = [];
-  let currentBuffer = '';
-  let isCollecting = false;
+  let i = events.length - 1;
 
-  for (const event of events) {
-    if (event.type === 'message') {
-      const content = event.content || '';
-      // For streaming events (delta=true), content fragments should be joined.
-      // We don't add newlines because these are likely parts of the same sentence/block.
-      currentBuffer += content;
-      isCollecting = true;
-      
-      // If we hit an explicitly complete message, treat it as a boundary
-      if (event.complete) {
-        if (currentBuffer.trim()) {
-          messages.push(currentBuffer);
-        }
-        currentBuffer = '';
-        isCollecting = false;
-      }
-    } else {
-      // Any non-message event breaks the message stream
-      if (isCollecting) {
-        if (currentBuffer.trim()) {
-          messages.push(currentBuffer);
-        }
-        currentBuffer = '';
-        isCollecting = false;
-      }
+  while (i >= from && messages.length < limit) {
+    if (events[i].type !== 'message') {
+      i--;
+      continue;
     }
-  }
 
-  // Handle any remaining buffer at the end
-  if (isCollecting && currentBuffer.trim()) {
-    messages.push(currentBuffer);
+    let start = i;
+    while (start > from && events[start - 1].type === 'message' && !events[start - 1].complete) {
+      start--;
+    }
+
+    let content = '';
+    for (let j = start; j <= i; j++) {
+      content += events[j].content || '';
+    }
+    if (content.trim()) {
+      messages.push(content);
+    }
+    i = start - 1;
   }
-  
-  return messages.slice(-count);
+
+  return messages.reverse();
 }
 
 export function getQuickStatus(
@@ -737,7 +979,7 @@ export function getQuickStatus(
       const cmd = event.command || '';
       if (cmd) {
         commands.push(cmd.length > 100 ? cmd.substring(0, 97) + '...' : cmd);
-        const [filesRead, filesWritten, filesDeleted] = extractFileOpsFromBash(cmd);
+        const [filesRead, filesWritten, filesDeleted] = getBashFileOps(cmd);
         for (const path of filesRead) {
           filesReadSet.add(path);
         }
@@ -750,7 +992,7 @@ export function getQuickStatus(
       }
     } else if (eventType === 'directory_list') {
       toolCount++;
-    } else if (['tool_use'].includes(eventType)) {
+    } else if (eventType === 'tool_use') {
       toolCount++;
     } else if (eventType === 'error' || (eventType === 'result' && event.status === 'error')) {
       hasErrors = true;
@@ -794,13 +1036,13 @@ export function getStatusSummary(
   for (const event of events) {
     const eventType = event.type || '';
 
-    if (['file_write', 'file_create', 'file_delete'].includes(eventType)) {
+    if (FILE_CHANGE_TYPES.has(eventType)) {
       fileCount++;
     } else if (eventType === 'bash') {
       bashCount++;
-    } else if (['tool_use', 'file_read'].includes(eventType)) {
+    } else if (eventType === 'tool_use' || eventType === 'file_read') {
       toolCount++;
-    } else if (['error', 'result'].includes(eventType)) {
+    } else if (OUTCOME_EVENT_TYPES.has(eventType)) {
       if (event.status === 'error') {
         hasErrors = true;
       }
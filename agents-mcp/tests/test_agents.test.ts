@@ -1,4 +1,4 @@
-import { describe, test, expect, beforeEach, afterEach } from 'bun:test';
+import { describe, test, expect, beforeAll, afterAll, beforeEach } from 'bun:test';
 import * as fs from 'fs/promises';
 import * as path from 'path';
 import { tmpdir } from 'os';
@@ -12,9 +12,19 @@ import {
   resolveMode,
   computePathLCA,
 } from '../src/agents.js';
-import type { EffortLevel } from '../src/agents.js';
+import type { EffortLevel, Mode } from '../src/agents.js';
 
-const TESTDATA_DIR = path.join(__dirname, 'testdata');
+// Scratch agent directories live under one temp root per run, outside the checked-in
+// tests/testdata fixtures; each test uses its own subdirectory and the root is removed once
+let testdataDir: string;
+
+beforeAll(async () => {
+  testdataDir = await fs.mkdtemp(path.join(tmpdir(), 'agents_mcp_agent_tests_'));
+});
+
+afterAll(async () => {
+  await fs.rm(testdataDir, { recursive: true, force: true });
+});
 
 describe('computePathLCA', () => {
   test('returns null for empty array', () => {
@@ -77,14 +87,18 @@ describe('computePathLCA', () => {
 });
 
 describe('Mode Resolution', () => {
-  test('should use default mode when no flags provided', () => {
-    const mode = resolveMode(null, 'edit');
-    expect(mode).toBe('edit');
-  });
+  test('should resolve the requested mode, falling back to the default', () => {
+    // [requested, default, expected]
+    const cases: Array<[string | null, Mode, Mode]> = [
+      [null, 'edit', 'edit'],
+      [null, 'plan', 'plan'],
+      ['edit', 'plan', 'edit'],
+      ['plan', 'edit', 'plan'],
+    ];
 
-  test('should return plan mode by default', () => {
-    const mode = resolveMode(null, 'plan');
-    expect(mode).toBe('plan');
+    for (const [requested, defaultMode, expected] of cases) {
+      expect(resolveMode(requested, defaultMode)).toBe(expected);
+    }
   });
 
   test('should reject invalid mode values', () => {
@@ -165,7 +179,8 @@ describe('AgentProcess', () => {
   });
 
   test('should calculate duration for running agent', () => {
-    const started = new Date();
+    // Started 90s ago: far enough from any unit or rounding boundary to give a fixed answer
+    const started = new Date(Date.now() - 90_000);
 
     const agent = new AgentProcess(
       'test-3',
@@ -179,13 +194,11 @@ describe('AgentProcess', () => {
       started
     );
 
-    const duration = agent.duration();
-    expect(duration).not.toBeNull();
-    expect(duration).toMatch(/seconds|minutes/);
+    expect(agent.duration()).toBe('1.5 minutes');
   });
 
   test('uses stdout log mtime for completion when events lack timestamps', async () => {
-    const baseDir = path.join(TESTDATA_DIR, `agent_process_${Date.now()}`);
+    const baseDir = path.join(testdataDir, 'agent_process');
     const agentId = 'agent-mtime';
     const agentDir = path.join(baseDir, agentId);
     const logPath = path.join(agentDir, 'stdout.log');
@@ -210,18 +223,46 @@ describe('AgentProcess', () => {
       baseDir
     );
 
-    try {
-      await agent.updateStatusFromProcess();
-      expect(agent.completedAt).not.toBeNull();
-      const delta = Math.abs((agent.completedAt as Date).getTime() - logTime.getTime());
-      expect(delta).toBeLessThan(1000);
-    } finally {
-      await fs.rm(baseDir, { recursive: true, force: true });
-    }
+    await agent.updateStatusFromProcess();
+    expect(agent.completedAt).not.toBeNull();
+    const delta = Math.abs((agent.completedAt as Date).getTime() - logTime.getTime());
+    expect(delta).toBeLessThan(1000);
+  });
+
+  test('parses the final event of a dead agent with more than one read of pending output', async () => {
+    const baseDir = path.join(testdataDir, 'agent_large_log');
+    const agentId = 'agent-large';
+    const agentDir = path.join(baseDir, agentId);
+    await fs.mkdir(agentDir, { recursive: true });
+
+    // ~1.2 MB of lines so the first capped read ends mid-line, then an unterminated final line
+    const filler = JSON.stringify({ type: 'item.completed', item: { type: 'agent_message', text: 'x'.repeat(1000) } });
+    const finalLine = JSON.stringify({ type: 'item.completed', item: { type: 'agent_message', text: 'All done' } });
+    await fs.writeFile(path.join(agentDir, 'stdout.log'), `${filler}\n`.repeat(1200) + finalLine);
+
+    const agent = new AgentProcess(
+      agentId,
+      'large-task',
+      'codex',
+      'Test prompt',
+      null,
+      'plan',
+      999999,
+      AgentStatus.RUNNING,
+      new Date('2024-01-01T00:00:00Z'),
+      null,
+      baseDir
+    );
+
+    for (let i = 0; i < 3; i++) await agent.readNewEvents();
+
+    expect(agent.events.length).toBe(1201);
+    expect(agent.events.filter(e => e.type === 'raw')).toEqual([]);
+    expect(agent.events[agent.events.length - 1].content).toBe('All done');
   });
 
   test('persists parent_session_id in metadata', async () => {
-    const baseDir = path.join(TESTDATA_DIR, `agent_meta_${Date.now()}`);
+    const baseDir = path.join(testdataDir, 'agent_meta');
     const agent = new AgentProcess(
       'meta-1',
       'meta-task',
@@ -237,19 +278,15 @@ describe('AgentProcess', () => {
       'session-xyz'
     );
 
-    try {
-      await agent.saveMeta();
-      const metaPath = await agent.getMetaPath();
-      const metaRaw = await fs.readFile(metaPath, 'utf-8');
-      const meta = JSON.parse(metaRaw);
-      expect(meta.parent_session_id).toBe('session-xyz');
-    } finally {
-      await fs.rm(baseDir, { recursive: true, force: true });
-    }
+    await agent.saveMeta();
+    const metaPath = await agent.getMetaPath();
+    const metaRaw = await fs.readFile(metaPath, 'utf-8');
+    const meta = JSON.parse(metaRaw);
+    expect(meta.parent_session_id).toBe('session-xyz');
   });
 
   test('loads parent_session_id from disk', async () => {
-    const baseDir = path.join(TESTDATA_DIR, `agent_meta_load_${Date.now()}`);
+    const baseDir = path.join(testdataDir, 'agent_meta_load');
     const agent = new AgentProcess(
       'meta-2',
       'meta-task',
@@ -265,18 +302,14 @@ describe('AgentProcess', () => {
       'session-abc'
     );
 
-    try {
-      await agent.saveMeta();
-      const loaded = await AgentProcess.loadFromDisk(agent.agentId, baseDir);
-      expect(loaded).not.toBeNull();
-      expect(loaded?.parentSessionId).toBe('session-abc');
-    } finally {
-      await fs.rm(baseDir, { recursive: true, force: true });
-    }
+    await agent.saveMeta();
+    const loaded = await AgentProcess.loadFromDisk(agent.agentId, baseDir);
+    expect(loaded).not.toBeNull();
+    expect(loaded?.parentSessionId).toBe('session-abc');
   });
 
   test('stores null parent_session_id when missing', async () => {
-    const baseDir = path.join(TESTDATA_DIR, `agent_meta_null_${Date.now()}`);
+    const baseDir = path.join(testdataDir, 'agent_meta_null');
     const agent = new AgentProcess(
       'meta-3',
       'meta-task',
@@ -292,19 +325,15 @@ describe('AgentProcess', () => {
       null
     );
 
-    try {
-      await agent.saveMeta();
-      const metaPath = await agent.getMetaPath();
-      const metaRaw = await fs.readFile(metaPath, 'utf-8');
-      const meta = JSON.parse(metaRaw);
-      expect(meta.parent_session_id).toBeNull();
-    } finally {
-      await fs.rm(baseDir, { recursive: true, force: true });
-    }
+    await agent.saveMeta();
+    const metaPath = await agent.getMetaPath();
+    const metaRaw = await fs.readFile(metaPath, 'utf-8');
+    const meta = JSON.parse(metaRaw);
+    expect(meta.parent_session_id).toBeNull();
   });
 
   test('persists workspace_dir in metadata', async () => {
-    const baseDir = path.join(TESTDATA_DIR, `agent_workspace_${Date.now()}`);
+    const baseDir = path.join(testdataDir, 'agent_workspace');
     const agent = new AgentProcess(
       'workspace-1',
       'workspace-task',
@@ -321,19 +350,36 @@ describe('AgentProcess', () => {
       '/Users/test/monorepo'
     );
 
-    try {
-      await agent.saveMeta();
-      const metaPath = await agent.getMetaPath();
-      const metaRaw = await fs.readFile(metaPath, 'utf-8');
-      const meta = JSON.parse(metaRaw);
-      expect(meta.workspace_dir).toBe('/Users/test/monorepo');
-    } finally {
-      await fs.rm(baseDir, { recursive: true, force: true });
-    }
+    await agent.saveMeta();
+    const metaPath = await agent.getMetaPath();
+    const metaRaw = await fs.readFile(metaPath, 'utf-8');
+    const meta = JSON.parse(metaRaw);
+    expect(meta.workspace_dir).toBe('/Users/test/monorepo');
+  });
+
+  test('loads persisted status from disk', async () => {
+    const baseDir = path.join(testdataDir, 'agent_status_load');
+    const agent = new AgentProcess(
+      'status-1',
+      'status-task',
+      'codex',
+      'Test prompt',
+      null,
+      'plan',
+      null,
+      AgentStatus.STOPPED,
+      new Date('2024-01-01T00:00:00Z'),
+      new Date('2024-01-01T00:05:00Z'),
+      baseDir
+    );
+
+    await agent.saveMeta();
+    const loaded = await AgentProcess.loadFromDisk(agent.agentId, baseDir);
+    expect(loaded?.status).toBe(AgentStatus.STOPPED);
   });
 
   test('loads workspace_dir from disk', async () => {
-    const baseDir = path.join(TESTDATA_DIR, `agent_workspace_load_${Date.now()}`);
+    const baseDir = path.join(testdataDir, 'agent_workspace_load');
     const agent = new AgentProcess(
       'workspace-2',
       'workspace-task',
@@ -350,14 +396,10 @@ describe('AgentProcess', () => {
       '/Users/test/project'
     );
 
-    try {
-      await agent.saveMeta();
-      const loaded = await AgentProcess.loadFromDisk(agent.agentId, baseDir);
-      expect(loaded).not.toBeNull();
-      expect(loaded?.workspaceDir).toBe('/Users/test/project');
-    } finally {
-      await fs.rm(baseDir, { recursive: true, force: true });
-    }
+    await agent.saveMeta();
+    const loaded = await AgentProcess.loadFromDisk(agent.agentId, baseDir);
+    expect(loaded).not.toBeNull();
+    expect(loaded?.workspaceDir).toBe('/Users/test/project');
   });
 
   test('includes workspace_dir in toDict output', () => {
@@ -484,48 +526,44 @@ describe('Effort Model Overrides', () => {
   });
 });
 
-describe('AgentCommands', () => {
-  test('should have commands for all agent types', () => {
-    expect('codex' in AGENT_COMMANDS).toBe(true);
-    expect('cursor' in AGENT_COMMANDS).toBe(true);
-    expect('gemini' in AGENT_COMMANDS).toBe(true);
-    expect('claude' in AGENT_COMMANDS).toBe(true);
-  });
+// Executable and tokens every base (plan mode) command template must carry
+const AGENT_COMMAND_EXPECTATIONS: Record<string, { executable: string; required: string[] }> = {
+  codex: { executable: 'codex', required: ['exec', '--json', '{prompt}'] },
+  cursor: { executable: 'cursor-agent', required: ['--output-format', 'stream-json', '{prompt}'] },
+  gemini: { executable: 'gemini', required: ['--output-format', 'stream-json', '{prompt}'] },
+  claude: { executable: 'claude', required: ['--output-format', 'stream-json', '{prompt}'] },
+  opencode: { executable: 'opencode', required: ['--format', 'json', '{prompt}'] },
+};
 
-  test('should have prompt placeholder in command templates', () => {
-    for (const cmdTemplate of Object.values(AGENT_COMMANDS)) {
-      const cmdStr = cmdTemplate.join(' ');
-      expect(cmdStr).toContain('{prompt}');
+describe('AgentCommands', () => {
+  test('should have a well-formed command template for every agent type', () => {
+    expect(Object.keys(AGENT_COMMANDS).sort()).toEqual(Object.keys(AGENT_COMMAND_EXPECTATIONS).sort());
+
+    for (const [agentType, { executable, required }] of Object.entries(AGENT_COMMAND_EXPECTATIONS)) {
+      const cmd = AGENT_COMMANDS[agentType as keyof typeof AGENT_COMMANDS];
+      expect(cmd[0]).toBe(executable);
+      for (const token of required) {
+        expect(cmd).toContain(token);
+      }
     }
-  });
 
-  test('should have correct Codex command structure', () => {
-    const cmd = AGENT_COMMANDS.codex;
-    expect(cmd[0]).toBe('codex');
-    expect(cmd).toContain('exec');
-    expect(cmd).toContain('--json');
-    // --full-auto is only added in edit mode, not in plan mode base command
-    expect(cmd).not.toContain('--full-auto');
+    // Auto-approve flags are only added for edit/ralph mode, never in the plan mode base commands
+    const templateTokens = new Set(Object.values(AGENT_COMMANDS).flat());
+    for (const flag of ['--full-auto', '--yolo', '-f', '--dangerously-skip-permissions']) {
+      expect(templateTokens.has(flag)).toBe(false);
+    }
   });
 });
 
-describe('AgentManager', () => {
+// Tests that never add agents or touch disk share one manager and directory
+describe('AgentManager (read-only)', () => {
   let manager: AgentManager;
   let testDir: string;
 
-  beforeEach(async () => {
-    testDir = path.join(tmpdir(), `agent_manager_tests_${Date.now()}`);
-    await fs.mkdir(testDir, { recursive: true });
+  beforeAll(async () => {
+    testDir = await fs.mkdtemp(path.join(testdataDir, 'agent_manager_ro_'));
     manager = new AgentManager(5, 10, testDir);
     await manager['initialize']();
-    manager['agents'].clear();
-  });
-
-  afterEach(async () => {
-    try {
-      await fs.rm(testDir, { recursive: true });
-    } catch {
-    }
   });
 
   test('should initialize with empty agent list', async () => {
@@ -533,10 +571,88 @@ describe('AgentManager', () => {
     expect(all.length).toBe(0);
   });
 
+  test('should place the prompt literally and add the opencode agent after it', () => {
+    const cmd: string[] = manager['buildCommand']('opencode', "cost is $& and $'", 'plan', 'some-model');
+    const promptIndex = AGENT_COMMANDS.opencode.indexOf('{prompt}');
+
+    expect(cmd[promptIndex].startsWith("cost is $& and $'")).toBe(true);
+    expect(cmd[promptIndex + 1]).toBe('--agent');
+    expect(cmd[promptIndex + 2]).toBe('plan');
+  });
+
+  test('should put the codex model flag ahead of the sandbox flag', () => {
+    const cmd: string[] = manager['buildCommand']('codex', 'Test', 'plan', 'some-model');
+    const modelIndex = cmd.indexOf('--model');
+
+    expect(cmd[modelIndex + 1]).toBe('some-model');
+    expect(cmd[modelIndex + 2]).toBe('--sandbox');
+    expect(cmd.slice(0, modelIndex)).toEqual(['codex', 'exec']);
+  });
+
   test('should return null for nonexistent agent', async () => {
     const agent = await manager.get('nonexistent');
     expect(agent).toBeNull();
   });
+});
+
+describe('AgentManager', () => {
+  let manager: AgentManager;
+  let testDir: string;
+
+  beforeEach(async () => {
+    // A fresh, empty directory per test under the run's temp root, which is removed once
+    testDir = await fs.mkdtemp(path.join(testdataDir, 'agent_manager_'));
+    manager = new AgentManager(5, 10, testDir);
+    await manager['initialize']();
+  });
+
+  test('should keep loaded agent instances across rescans', async () => {
+    const agent = new AgentProcess(
+      'rescan-1',
+      'rescan-task',
+      'codex',
+      'Test prompt',
+      null,
+      'plan',
+      null,
+      AgentStatus.COMPLETED,
+      new Date(),
+      new Date(),
+      testDir
+    );
+    await agent.saveMeta();
+
+    await manager['initialize']();
+    const loaded = manager['agents'].get('rescan-1');
+    expect(loaded?.status).toBe(AgentStatus.COMPLETED);
+
+    await manager['initialize']();
+    expect(manager['agents'].get('rescan-1')).toBe(loaded);
+  });
+
+  test('should load agent directories that are symlinks', async () => {
+    const elsewhere = await fs.mkdtemp(path.join(testdataDir, 'agent_elsewhere_'));
+    const agent = new AgentProcess(
+      'linked-1',
+      'linked-task',
+      'codex',
+      'Test prompt',
+      null,
+      'plan',
+      null,
+      AgentStatus.COMPLETED,
+      new Date(),
+      new Date(),
+      elsewhere
+    );
+    await agent.saveMeta();
+    await fs.symlink(path.join(elsewhere, 'linked-1'), path.join(testDir, 'linked-1'), 'dir');
+    await fs.symlink(path.join(elsewhere, 'missing'), path.join(testDir, 'dangling'), 'dir');
+
+    await manager['initialize']();
+    expect(Array.from(manager['agents'].keys())).toEqual(['linked-1']);
+    expect(manager['agents'].get('linked-1')?.taskName).toBe('linked-task');
+  });
 
   test('should list running agents correctly', async () => {
     const running1 = new AgentProcess(
@@ -576,7 +692,7 @@ describe('AgentManager', () => {
 
     const running = await manager.listRunning();
     expect(running.length).toBe(2);
-    expect(running.every(a => a.status === AgentStatus.RUNNING)).toBe(true);
+    expect([...new Set(running.map(a => a.status))]).toEqual([AgentStatus.RUNNING]);
   });
 
   test('should list completed agents correctly', async () => {
@@ -617,15 +733,68 @@ describe('AgentManager', () => {
 
     const completed = await manager.listCompleted();
     expect(completed.length).toBe(2);
-    expect(completed.every(a => a.status !== AgentStatus.RUNNING)).toBe(true);
+    // "Completed" covers every terminal status, failures included
+    expect([...new Set(completed.map(a => a.status))].sort()).toEqual([AgentStatus.COMPLETED, AgentStatus.FAILED].sort());
   });
 
-  test('should stop nonexistent agent and return false', async () => {
-    const success = await manager.stop('nonexistent');
-    expect(success).toBe(false);
+  test('should evict the oldest completed agents beyond maxAgents', async () => {
+    // Timestamps are computed once and offset per agent; agent i completed i minutes after the base
+    const base = Date.parse('2024-01-01T00:00:00Z');
+    const completedAgent = (i: number) => new AgentProcess(
+      `test-${i}`,
+      'cleanup-task',
+      'codex',
+      'Test',
+      null,
+      'plan',
+      null,
+      AgentStatus.COMPLETED,
+      new Date(base),
+      new Date(base + i * 60_000),
+      testDir
+    );
+
+    const agents = Array.from({ length: 7 }, (_, i) => completedAgent(i));
+    await Promise.all(agents.map(agent => agent.saveMeta()));
+    manager['agents'] = new Map(agents.map(agent => [agent.agentId, agent]));
+
+    await manager['cleanupOldAgents']();
+
+    const remaining = Array.from(manager['agents'].keys()).sort();
+    expect(remaining).toEqual(['test-2', 'test-3', 'test-4', 'test-5', 'test-6']);
+    const onDisk = (await fs.readdir(testDir)).sort();
+    expect(onDisk).toEqual(remaining);
   });
 
-  test('should stop already completed agent and return false', async () => {
+  test('should evict only the oldest completed agent when one over maxAgents', async () => {
+    // Completion offsets in minutes, out of order so the oldest is neither first nor last
+    const base = Date.parse('2024-01-01T00:00:00Z');
+    const offsets = [30, 45, 5, 20, 60, 10];
+    const agents = offsets.map((minutes, i) => new AgentProcess(
+      `test-${i}`,
+      'cleanup-task',
+      'codex',
+      'Test',
+      null,
+      'plan',
+      null,
+      AgentStatus.COMPLETED,
+      new Date(base),
+      new Date(base + minutes * 60_000),
+      testDir
+    ));
+    await Promise.all(agents.map(agent => agent.saveMeta()));
+    manager['agents'] = new Map(agents.map(agent => [agent.agentId, agent]));
+
+    await manager['cleanupOldAgents']();
+
+    const remaining = Array.from(manager['agents'].keys()).sort();
+    expect(remaining).toEqual(['test-0', 'test-1', 'test-3', 'test-4', 'test-5']);
+    const onDisk = (await fs.readdir(testDir)).sort();
+    expect(onDisk).toEqual(remaining);
+  });
+
+  test('should return false when stopping an agent that is not running', async () => {
     const agent = new AgentProcess(
       'completed-1',
       'task-1',
@@ -638,8 +807,11 @@ describe('AgentManager', () => {
     );
     manager['agents'].set('completed-1', agent);
 
-    const success = await manager.stop('completed-1');
-    expect(success).toBe(false);
+    // Unknown agent, then one that already finished
+    for (const agentId of ['nonexistent', 'completed-1']) {
+      expect(await manager.stop(agentId)).toBe(false);
+    }
+    expect(agent.status).toBe(AgentStatus.COMPLETED);
   });
 
   test('should list agents by task name', async () => {
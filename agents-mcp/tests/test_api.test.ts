@@ -3,57 +3,72 @@
  * These tests call the REAL handler functions with actual logging.
  */
 
-import { describe, test, expect, beforeEach, afterEach } from 'bun:test';
+import { describe, test, expect, beforeAll, afterAll, beforeEach } from 'bun:test';
 import * as fs from 'fs/promises';
+import { appendFileSync, mkdirSync, writeFileSync } from 'fs';
 import * as path from 'path';
-import { tmpdir } from 'os';
+import { homedir, tmpdir } from 'os';
 import { AgentManager, AgentProcess, AgentStatus, checkCliAvailable } from '../src/agents.js';
 import { handleSpawn, handleStatus, handleStop, handleTasks } from '../src/api.js';
+import { getRalphConfig, isDangerousPath, buildRalphPrompt } from '../src/ralph.js';
+
+// Looked up once for the whole file; tests that really spawn codex branch on it
+const [CODEX_INSTALLED] = checkCliAvailable('codex');
+// The live polling test spawns these; with none installed it is skipped before any setup
+const LIVE_POLLING_CLI_INSTALLED = (['codex', 'cursor', 'claude'] as const).some(
+  agentType => checkCliAvailable(agentType)[0]
+);
+
+/** Run handleSpawn and return the error it rejects with, or null if it succeeds. */
+async function spawnError(...args: Parameters<typeof handleSpawn>): Promise<any> {
+  try {
+    await handleSpawn(...args);
+    return null;
+  } catch (err) {
+    return err;
+  }
+}
 
 describe('API Integration Tests', () => {
   let manager: AgentManager;
+  let testRoot: string;
   let testDir: string;
 
+  // Each test gets a fresh manager and an empty agents dir under one temp root, removed once
+  beforeAll(async () => {
+    testRoot = await fs.mkdtemp(path.join(tmpdir(), 'api_tests_'));
+  });
+
+  afterAll(async () => {
+    await fs.rm(testRoot, { recursive: true, force: true });
+  });
+
   beforeEach(async () => {
-    testDir = path.join(tmpdir(), `api_tests_${Date.now()}`);
-    await fs.mkdir(testDir, { recursive: true });
+    testDir = await fs.mkdtemp(path.join(testRoot, 'agents_'));
     manager = new AgentManager(50, 10, testDir);
     await manager['initialize']();
   });
 
-  afterEach(async () => {
-    try {
-      await fs.rm(testDir, { recursive: true });
-    } catch {}
-  });
-
   describe('handleSpawn', () => {
     test('should fail gracefully when CLI not installed', async () => {
       // This tests the REAL spawn path - it will fail because codex isn't installed
       // But we verify the error handling works correctly
       console.log('\n--- TEST: spawn with missing CLI ---');
 
-      try {
-        const result = await handleSpawn(
-          manager,
-          'test-task',
-          'codex',
-          'Write hello world',
-          null,
-          null,
-          null
-        );
-        // If we get here, codex IS installed - which is also valid
-        console.log('Result:', JSON.stringify(result, null, 2));
-        expect(result.task_name).toBe('test-task');
-        expect(result.agent_id).toBeDefined();
-        expect(result.agent_type).toBe('codex');
-        console.log(`SUCCESS: Spawned agent ${result.agent_id}`);
-      } catch (err: any) {
-        // Expected when CLI not installed
-        console.log('Expected error (CLI not installed):', err.message);
-        expect(err.message).toMatch(/not found|not available|CLI tool/i);
+      if (!CODEX_INSTALLED) {
+        const error = await spawnError(manager, 'test-task', 'codex', 'Write hello world');
+        console.log('Expected error (CLI not installed):', error?.message);
+        expect(error?.message).toMatch(/not found|not available|CLI tool/i);
+        return;
       }
+
+      // codex IS installed - which is also valid
+      const result = await handleSpawn(manager, 'test-task', 'codex', 'Write hello world');
+      console.log('Result:', JSON.stringify(result, null, 2));
+      expect(result.task_name).toBe('test-task');
+      expect(result.agent_id).toBeDefined();
+      expect(result.agent_type).toBe('codex');
+      console.log(`SUCCESS: Spawned agent ${result.agent_id}`);
     });
 
     test('should check CLI availability before spawn', async () => {
@@ -83,28 +98,16 @@ describe('API Integration Tests', () => {
       const existing = new AgentProcess('agent-existing', 'dup-task', 'codex', 'noop', null, 'plan', null, AgentStatus.RUNNING);
       manager['agents'].set(existing.agentId, existing);
 
-      let error: any = null;
-      let result: any = null;
-      try {
-        result = await handleSpawn(
-          manager,
-          'dup-task',
-          'codex',
-          'Write hello world',
-          null,
-          null,
-          null
-        );
-      } catch (err: any) {
-        error = err;
+      if (!CODEX_INSTALLED) {
+        // Spawn still fails, but on the missing CLI rather than the reused task name
+        const error = await spawnError(manager, 'dup-task', 'codex', 'Write hello world');
+        expect(error?.code).not.toBe('TASK_NAME_IN_USE');
+        expect(error?.message).toMatch(/not found|not available|CLI tool/i);
+        return;
       }
 
-      if (error) {
-        expect(error.code).not.toBe('TASK_NAME_IN_USE');
-      } else {
-        expect(result).toBeTruthy();
-        expect(result.task_name).toBe('dup-task');
-      }
+      const result = await handleSpawn(manager, 'dup-task', 'codex', 'Write hello world');
+      expect(result.task_name).toBe('dup-task');
     });
   });
 
@@ -303,10 +306,9 @@ describe('API Integration Tests', () => {
         expect(taskStatus.summary.completed).toBe(1);
       }
 
-      // Step 3: Get individual agent status (by finding in task status)
+      // Step 3: Get individual agent status from the task status fetched above
       console.log('\n[Step 3] Getting detailed status for agent "flow-1"...');
-      const taskStatusForAgent = await handleStatus(manager, 'feature-x', 'all');
-      const agentStatus = taskStatusForAgent.agents.find(a => a.agent_id === 'flow-1');
+      const agentStatus = taskStatus.agents.find(a => a.agent_id === 'flow-1');
       console.log('Agent status:', JSON.stringify(agentStatus, null, 2));
 
       expect(agentStatus).toBeDefined();
@@ -334,12 +336,11 @@ describe('API Integration Tests', () => {
   });
 
   describe('Multi-Agent Status Polling (Live)', () => {
-    test('should spawn claude, codex, and cursor agents with different tasks and poll status until done', async () => {
+    (LIVE_POLLING_CLI_INSTALLED ? test : test.skip)('should spawn claude, codex, and cursor agents with different tasks and poll status until done', async () => {
       console.log('\n--- TEST: multi-agent status polling (live) ---');
       
       const testdataDir = path.join(__dirname, 'testdata');
       const statusLogPath = path.join(testdataDir, 'multi-agent-status-polling.jsonl');
-      const { writeFileSync, appendFileSync, mkdirSync } = await import('fs');
       
       const taskName = `multi-agent-live-${Date.now()}`;
       const timestamp = Date.now();
@@ -675,9 +676,9 @@ describe('API Integration Tests', () => {
     let ralphTestDir: string;
     let ralphFilePath: string;
 
-    beforeEach(async () => {
-      ralphTestDir = path.join(testDir, 'ralph-project');
-      await fs.mkdir(ralphTestDir, { recursive: true });
+    // No test changes RALPH.md, so the project directory is created once for the block
+    beforeAll(async () => {
+      ralphTestDir = await fs.mkdtemp(path.join(tmpdir(), 'ralph_project_'));
       ralphFilePath = path.join(ralphTestDir, 'RALPH.md');
 
       // Create a sample RALPH.md with test tasks
@@ -698,23 +699,14 @@ Write a summary of completed tasks.
       await fs.writeFile(ralphFilePath, sampleRalph);
     });
 
+    afterAll(async () => {
+      await fs.rm(ralphTestDir, { recursive: true, force: true });
+    });
+
     test('should reject ralph mode without cwd parameter', async () => {
       console.log('\n--- TEST: ralph mode without cwd ---');
 
-      let error: any = null;
-      try {
-        await handleSpawn(
-          manager,
-          'ralph-task',
-          'codex',
-          'Build something',
-          null,
-          'ralph',
-          null
-        );
-      } catch (err: any) {
-        error = err;
-      }
+      const error = await spawnError(manager, 'ralph-task', 'codex', 'Build something', null, 'ralph');
 
       expect(error).toBeTruthy();
       expect(error.message).toContain('cwd');
@@ -726,72 +718,23 @@ Write a summary of completed tasks.
       const nothingDir = path.join(testDir, 'empty-project');
       await fs.mkdir(nothingDir, { recursive: true });
 
-      let error: any = null;
-      try {
-        await handleSpawn(
-          manager,
-          'ralph-task',
-          'codex',
-          'Build something',
-          nothingDir,
-          'ralph',
-          null
-        );
-      } catch (err: any) {
-        error = err;
-      }
+      const error = await spawnError(manager, 'ralph-task', 'codex', 'Build something', nothingDir, 'ralph');
 
       expect(error).toBeTruthy();
       expect(error.message).toContain('RALPH.md');
       expect(error.message).toContain('not found');
     });
 
-    test('should reject ralph mode in home directory', async () => {
-      console.log('\n--- TEST: ralph mode in dangerous directory ---');
+    test('should reject ralph mode in home and system directories', async () => {
+      console.log('\n--- TEST: ralph mode in dangerous directories ---');
 
-      const homeDir = require('os').homedir();
-      const ralphInHome = path.join(homeDir, '.test-ralph');
+      // Home directory, and /System (macOS); neither is created - just test the rejection
+      for (const dangerousDir of [homedir(), '/System/Library']) {
+        const error = await spawnError(manager, 'ralph-dangerous', 'codex', 'Build something', dangerousDir, 'ralph');
 
-      // Don't actually create it - just test the rejection
-      let error: any = null;
-      try {
-        await handleSpawn(
-          manager,
-          'ralph-dangerous',
-          'codex',
-          'Build something',
-          homeDir,
-          'ralph',
-          null
-        );
-      } catch (err: any) {
-        error = err;
+        expect(error).toBeTruthy();
+        expect(error.message).toMatch(/risky|dangerous/i);
       }
-
-      expect(error).toBeTruthy();
-      expect(error.message).toMatch(/risky|dangerous|home|system/i);
-    });
-
-    test('should reject ralph mode in /System directory (macOS)', async () => {
-      console.log('\n--- TEST: ralph mode in /System ---');
-
-      let error: any = null;
-      try {
-        await handleSpawn(
-          manager,
-          'ralph-system',
-          'codex',
-          'Build something',
-          '/System/Library',
-          'ralph',
-          null
-        );
-      } catch (err: any) {
-        error = err;
-      }
-
-      expect(error).toBeTruthy();
-      expect(error.message).toMatch(/risky|dangerous/i);
     });
 
     test('should validate RALPH.md exists before spawn', async () => {
@@ -824,7 +767,6 @@ Write a summary of completed tasks.
         process.env.AGENTS_MCP_RALPH_FILE = customName;
 
         // Verify it reads the env var
-        const { getRalphConfig } = await import('../src/ralph.js');
         const config = getRalphConfig();
         expect(config.ralphFile).toBe(customName);
       } finally {
@@ -840,7 +782,6 @@ Write a summary of completed tasks.
       console.log('\n--- TEST: ralph mode in safe project directory ---');
 
       // Verify path is safe
-      const { isDangerousPath } = await import('../src/ralph.js');
       const isSafe = !isDangerousPath(ralphTestDir);
       expect(isSafe).toBe(true);
 
@@ -850,7 +791,6 @@ Write a summary of completed tasks.
     test('should prompt buildRalphPrompt with correct file path', async () => {
       console.log('\n--- TEST: ralph prompt building ---');
 
-      const { buildRalphPrompt } = await import('../src/ralph.js');
       const userPrompt = 'Complete all tasks in RALPH.md';
       const prompt = buildRalphPrompt(userPrompt, ralphFilePath);
 
@@ -2,7 +2,7 @@ import { describe, test, expect } from 'bun:test';
 import { fileURLToPath } from 'url';
 import { dirname, join } from 'path';
 import { tmpdir } from 'os';
-import { mkdtempSync, rmSync, writeFileSync, unlinkSync } from 'fs';
+import { mkdirSync, mkdtempSync, readFileSync, rmSync, writeFileSync, unlinkSync } from 'fs';
 import { AgentManager, checkCliAvailable, AgentStatus } from '../src/agents.js';
 import { handleSpawn, handleStatus, handleStop, AgentStatusDetail, SpawnResult } from '../src/api.js';
 import { AgentType } from '../src/parsers.js';
@@ -52,7 +52,7 @@ describe('Codex Live E2E', () => {
 
     console.log('Running codex with prompt:', prompt);
 
-    const spawnResult = await handleSpawn(manager, 'test-codex', 'codex', prompt, null, 'edit', null);
+    const spawnResult = await handleSpawn(manager, 'test-codex', 'codex', prompt, null, 'edit');
     console.log('Spawned agent:', spawnResult.agent_id);
     
     const statusResult = await pollUntilComplete(manager, 'test-codex', spawnResult.agent_id, 90, 2000);
@@ -93,8 +93,6 @@ describe('Codex Live E2E', () => {
     const testDir = `/tmp/codex-comprehensive-test-${Date.now()}`;
     const testDataPath = `${testDir}/tests/testdata`;
     
-    const { mkdirSync, writeFileSync, readFileSync } = await import('fs');
-    
     try {
       mkdirSync(testDataPath, { recursive: true });
       mkdirSync(join(testDataPath, 'dir1'), { recursive: true });
@@ -126,7 +124,7 @@ describe('Codex Live E2E', () => {
 
       console.log('Running comprehensive test with prompt:', prompt);
       
-      const spawnResult = await handleSpawn(manager, 'test-codex', 'codex', prompt, testDataPath, 'edit', null);
+      const spawnResult = await handleSpawn(manager, 'test-codex', 'codex', prompt, testDataPath, 'edit');
       console.log('Spawned agent:', spawnResult.agent_id);
       
       const statusResult = await pollUntilComplete(manager, 'test-codex', spawnResult.agent_id, 180, 2000);
@@ -158,7 +156,6 @@ describe('Codex Live E2E', () => {
       
     } finally {
       try {
-        const { rmSync } = await import('fs');
         rmSync(testDir, { recursive: true, force: true });
       } catch {
       }
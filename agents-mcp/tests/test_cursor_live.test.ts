@@ -2,7 +2,7 @@ import { describe, test, expect } from 'bun:test';
 import { fileURLToPath } from 'url';
 import { dirname, join } from 'path';
 import { tmpdir } from 'os';
-import { mkdtempSync, rmSync, writeFileSync, unlinkSync } from 'fs';
+import { mkdirSync, mkdtempSync, readFileSync, rmSync, writeFileSync, unlinkSync } from 'fs';
 import { AgentManager, checkCliAvailable, AgentStatus } from '../src/agents.js';
 import { handleSpawn, handleStatus, handleStop, AgentStatusDetail } from '../src/api.js';
 
@@ -51,7 +51,7 @@ describe('Cursor Live E2E', () => {
 
     console.log('Running cursor-agent with prompt:', prompt);
 
-    const spawnResult = await handleSpawn(manager, 'test-cursor', 'cursor', prompt, null, null, null);
+    const spawnResult = await handleSpawn(manager, 'test-cursor', 'cursor', prompt);
     console.log('Spawned agent:', spawnResult.agent_id);
     
     const statusResult = await pollUntilComplete(manager, 'test-cursor', spawnResult.agent_id, 90, 2000);
@@ -92,8 +92,6 @@ describe('Cursor Live E2E', () => {
     const testDir = `/tmp/cursor-comprehensive-test-${Date.now()}`;
     const testDataPath = `${testDir}/tests/testdata`;
     
-    const { mkdirSync, writeFileSync, readFileSync } = await import('fs');
-    
     try {
       mkdirSync(testDataPath, { recursive: true });
       mkdirSync(join(testDataPath, 'dir1'), { recursive: true });
@@ -125,7 +123,7 @@ describe('Cursor Live E2E', () => {
 
       console.log('Running comprehensive test with prompt:', prompt);
       
-      const spawnResult = await handleSpawn(manager, 'test-cursor', 'cursor', prompt, testDataPath, null, null);
+      const spawnResult = await handleSpawn(manager, 'test-cursor', 'cursor', prompt, testDataPath);
       console.log('Spawned agent:', spawnResult.agent_id);
       
       const statusResult = await pollUntilComplete(manager, 'test-cursor', spawnResult.agent_id, 180, 2000);
@@ -158,7 +156,6 @@ describe('Cursor Live E2E', () => {
       
     } finally {
       try {
-        const { rmSync } = await import('fs');
         rmSync(testDir, { recursive: true, force: true });
       } catch {
       }
@@ -0,0 +1,70 @@
+import { describe, test, expect } from 'bun:test';
+import { extractFileOpsFromBash } from '../src/file_ops.js';
+
+// [command, [files read, files written, files deleted]]
+const FILE_OPS_CASES: [string, [string[], string[], string[]]][] = [
+  // Redirects and descriptor duplication
+  ['cat a 2>&1 > b', [['a'], ['b'], []]],
+  ['cat file1 file2 > merged', [['file1', 'file2'], ['merged'], []]],
+  ['cat file 1>out', [['file'], ['out'], []]],
+  ['cat file &> out.log', [['file'], ['out.log'], []]],
+  ['cat file &>> out.log', [['file'], ['out.log'], []]],
+  ['cat file 2>/dev/null', [['file'], [], []]],
+  ['cat file >&2', [['file'], [], []]],
+  ['cat file >&out.log', [['file'], ['out.log'], []]],
+  ['echo hi 2>&err.log', [[], [], []]],
+  ['cat a.txt > log.txt 2>&1 <&0', [['a.txt'], ['log.txt'], []]],
+  ['echo hi > out.txt', [[], ['out.txt'], []]],
+  ['echo hi >> log.txt', [[], ['log.txt'], []]],
+  ['printf "%s" x 2>&1 >out.txt', [[], ['out.txt'], []]],
+  ['cat < in.txt', [['in.txt'], [], []]],
+
+  // Process substitution
+  ['cat <(ls src) b.txt', [['b.txt'], [], []]],
+  ['tee >(rm x.txt) out.txt < in.txt', [['in.txt'], ['out.txt'], []]],
+  ['diff <(sed -n "1p" "a (1).txt") <(head b.txt) > d.patch', [[], [], []]],
+
+  // Heredocs and here-strings
+  ['cat <<EOF > notes.md\nrm -rf body.txt\nEOF', [[], ['notes.md'], []]],
+  ['cat <<-"END" > notes.md\n\tcat secret.txt\n\tEND\nrm stale.txt', [[], ['notes.md'], ['stale.txt']]],
+  ['cat <<< hello.txt', [[], [], []]],
+
+  // Pipelines and chains
+  ['cat a.txt | tee b.txt', [['a.txt'], ['b.txt'], []]],
+  ['head -n 5 a.txt && rm b.txt', [['a.txt'], [], ['b.txt']]],
+  ['cat a.txt; echo done > status.txt', [['a.txt'], ['status.txt'], []]],
+  ['rm a.txt || tail b.txt', [['b.txt'], [], ['a.txt']]],
+  ['cat a.txt\nrm b.txt', [['a.txt'], [], ['b.txt']]],
+
+  // Quoted operands
+  ['cat "my file.txt"', [['my file.txt'], [], []]],
+  ["rm 'a b.txt' c\\ d.txt", [[], [], ['a b.txt', 'c d.txt']]],
+  ['echo "a > b" > "out file.txt"', [[], ['out file.txt'], []]],
+
+  // Per-command operand rules
+  ["sed -i 's/a/b/' config.ts", [[], ['config.ts'], []]],
+  ["sed -i.bak 's/a/b/' config.ts", [[], ['config.ts'], []]],
+  ["sed -n '1,20p' src/app.ts", [['src/app.ts'], [], []]],
+  ["sed 's/a/b/' src/app.ts", [[], [], []]],
+  ['head -n 20 a.txt b.txt', [['a.txt', 'b.txt'], [], []]],
+  ['tail -c 100 -f log.txt', [['log.txt'], [], []]],
+  ['tee -a out.txt extra.txt', [[], ['out.txt'], []]],
+  ['rm -rf dist build', [[], [], ['dist', 'build']]],
+  ['/bin/rm old.txt', [[], [], ['old.txt']]],
+  ['cat a.txt a.txt', [['a.txt'], [], []]],
+
+  // Shell wrappers
+  ["bash -lc 'cat a.txt > b.txt'", [['a.txt'], ['b.txt'], []]],
+  ['/bin/zsh -c "rm -f tmp.txt"', [[], [], ['tmp.txt']]],
+  ["bash -lc 'cat \"my file.txt\" | head -n 1'", [['my file.txt'], [], []]],
+  ['bash -lc "cat \\"a b\\""', [['a b'], [], []]],
+  ['bash -lc "echo \\$HOME > \\"out dir/log.txt\\""', [[], ['out dir/log.txt'], []]],
+];
+
+describe('extractFileOpsFromBash', () => {
+  for (const [command, expected] of FILE_OPS_CASES) {
+    test(`should extract file ops from ${JSON.stringify(command)}`, () => {
+      expect(extractFileOpsFromBash(command)).toEqual(expected);
+    });
+  }
+});
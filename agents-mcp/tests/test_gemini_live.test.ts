@@ -2,7 +2,7 @@ import { describe, test, expect } from 'bun:test';
 import { fileURLToPath } from 'url';
 import { dirname, join } from 'path';
 import { tmpdir } from 'os';
-import { mkdtempSync, rmSync, writeFileSync, unlinkSync } from 'fs';
+import { mkdirSync, mkdtempSync, readFileSync, rmSync, writeFileSync, unlinkSync } from 'fs';
 import { AgentManager, checkCliAvailable, AgentStatus } from '../src/agents.js';
 import { handleSpawn, handleStatus, handleStop, AgentStatusDetail, SpawnResult } from '../src/api.js';
 import { AgentType } from '../src/parsers.js';
@@ -53,7 +53,7 @@ describe('Gemini Live E2E', () => {
 
     console.log('Running gemini with prompt:', prompt);
 
-    const spawnResult = await handleSpawn(manager, 'test-gemini', 'gemini', prompt, null, 'edit', null);
+    const spawnResult = await handleSpawn(manager, 'test-gemini', 'gemini', prompt, null, 'edit');
     console.log('Spawned agent:', spawnResult.agent_id);
     
     const statusResult = await pollUntilComplete(manager, 'test-gemini', spawnResult.agent_id, 90, 2000);
@@ -95,8 +95,6 @@ describe('Gemini Live E2E', () => {
     const testSubDir = join(testdataDir, `gemini-comprehensive-test-${Date.now()}`);
     const testDataPath = testSubDir;
     
-    const { mkdirSync, writeFileSync, readFileSync } = await import('fs');
-    
     try {
       mkdirSync(testDataPath, { recursive: true });
       mkdirSync(join(testDataPath, 'dir1'), { recursive: true });
@@ -128,7 +126,7 @@ describe('Gemini Live E2E', () => {
 
       console.log('Running comprehensive test with prompt:', prompt);
       
-      const spawnResult = await handleSpawn(manager, 'test-gemini', 'gemini', prompt, testDataPath, 'edit', null);
+      const spawnResult = await handleSpawn(manager, 'test-gemini', 'gemini', prompt, testDataPath, 'edit');
       console.log('Spawned agent:', spawnResult.agent_id);
       
       const statusResult = await pollUntilComplete(manager, 'test-gemini', spawnResult.agent_id, 180, 2000);
@@ -168,7 +166,6 @@ describe('Gemini Live E2E', () => {
       
     } finally {
       try {
-        const { rmSync } = await import('fs');
         rmSync(testSubDir, { recursive: true, force: true });
       } catch {
       }
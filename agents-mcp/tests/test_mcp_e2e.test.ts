@@ -34,6 +34,17 @@ interface MCPMessage {
   error?: { code: number; message: string };
 }
 
+/**
+ * Wait until `read()` matches `pattern`, checking every 50ms, or until `timeoutMs` passes.
+ * Lets startup tests continue as soon as the server has logged instead of after a fixed delay.
+ */
+async function waitForMatch(read: () => string, pattern: RegExp, timeoutMs: number = 5000): Promise<void> {
+  const deadline = Date.now() + timeoutMs;
+  while (!pattern.test(read()) && Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, 50));
+  }
+}
+
 /**
  * Spawns the MCP server and provides helpers for sending/receiving messages.
  */
@@ -330,7 +341,7 @@ describe('MCP Server Startup Tests', () => {
     });
 
     // Wait for startup
-    await new Promise(resolve => setTimeout(resolve, 1000));
+    await waitForMatch(() => stderr, /agent-swarm/);
 
     // Server should still be running
     expect(serverProcess.exitCode).toBeNull();
@@ -352,7 +363,7 @@ describe('MCP Server Startup Tests', () => {
       stderr += data.toString();
     });
 
-    await new Promise(resolve => setTimeout(resolve, 1000));
+    await waitForMatch(() => stderr, /agent-swarm.*v\d+\.\d+\.\d+/i);
 
     // Should log server version on startup
     expect(stderr).toMatch(/agent-swarm.*v\d+\.\d+\.\d+/i);
@@ -50,7 +50,7 @@ describe('OpenCode Live E2E', () => {
 
     console.log('Running opencode with prompt:', prompt);
 
-    const spawnResult = await handleSpawn(manager, 'test-opencode', 'opencode', prompt, null, 'edit', null);
+    const spawnResult = await handleSpawn(manager, 'test-opencode', 'opencode', prompt, null, 'edit');
     console.log('Spawned agent:', spawnResult.agent_id);
 
     const statusResult = await pollUntilComplete(manager, 'test-opencode', spawnResult.agent_id, 90, 2000);
@@ -84,7 +84,7 @@ describe('OpenCode Live E2E', () => {
 
     const prompt = `Describe what files are in the current directory`;
 
-    const spawnResult = await handleSpawn(manager, 'test-opencode-plan', 'opencode', prompt, null, 'plan', null);
+    const spawnResult = await handleSpawn(manager, 'test-opencode-plan', 'opencode', prompt, null, 'plan');
     const statusResult = await pollUntilComplete(manager, 'test-opencode-plan', spawnResult.agent_id, 60, 2000);
 
     expect(statusResult.status).not.toBe(AgentStatus.RUNNING);
@@ -3,118 +3,70 @@ import { normalizeEvent, normalizeEvents, parseEvent } from '../src/parsers.js';
 import { readFileSync } from 'fs';
 import { join } from 'path';
 
-describe('Codex Parser', () => {
-  test('should normalize thread.started event', () => {
-    const raw = { type: 'thread.started', thread_id: 'test-123' };
-    const event = normalizeEvent('codex', raw);
-
-    expect(event.type).toBe('init');
-    expect(event.agent).toBe('codex');
-    expect(event.session_id).toBe('test-123');
-    expect(event.timestamp).toBeDefined();
-  });
-
-  test('should normalize turn.started event', () => {
-    const raw = { type: 'turn.started' };
-    const event = normalizeEvent('codex', raw);
-
-    expect(event.type).toBe('turn_start');
-    expect(event.agent).toBe('codex');
-  });
-
-  test('should normalize agent_message item', () => {
-    const raw = {
-      type: 'item.completed',
-      item: {
-        type: 'agent_message',
-        text: "Hello, I'm working on this task.",
-      },
-    };
-    const event = normalizeEvent('codex', raw);
-
-    expect(event.type).toBe('message');
-    expect(event.agent).toBe('codex');
-    expect(event.content).toBe("Hello, I'm working on this task.");
-    expect(event.complete).toBe(true);
-  });
-
-  test('should normalize file write tool call', () => {
-    const raw = {
-      type: 'item.completed',
-      item: {
-        type: 'tool_call',
-        name: 'write_file',
-        arguments: { path: 'src/auth.ts', content: '...' },
-      },
-    };
-    const event = normalizeEvent('codex', raw);
-
-    expect(event.type).toBe('file_write');
-    expect(event.agent).toBe('codex');
-    expect(event.tool).toBe('write_file');
-    expect(event.path).toBe('src/auth.ts');
-  });
-
-  test('should normalize file read tool call', () => {
-    const raw = {
-      type: 'item.completed',
-      item: {
-        type: 'tool_call',
-        name: 'read_file',
-        arguments: { path: 'src/auth.ts' },
-      },
-    };
-    const event = normalizeEvent('codex', raw);
-
-    expect(event.type).toBe('file_read');
-    expect(event.path).toBe('src/auth.ts');
-  });
-
-  test('should normalize bash tool call', () => {
-    const raw = {
-      type: 'item.completed',
-      item: {
-        type: 'tool_call',
-        name: 'shell',
-        arguments: { command: 'npm install' },
-      },
-    };
-    const event = normalizeEvent('codex', raw);
-
-    expect(event.type).toBe('bash');
-    expect(event.tool).toBe('shell');
-    expect(event.command).toBe('npm install');
-  });
+function deepFreeze<T>(value: T): T {
+  if (value && typeof value === 'object' && !Object.isFrozen(value)) {
+    Object.freeze(value);
+    for (const child of Object.values(value)) deepFreeze(child);
+  }
+  return value;
+}
+
+// [name, raw codex event, fields the normalized event must carry]. Raw events are frozen
+// once here and shared by every run; normalizeEvent must treat its input as read-only.
+const CODEX_CASES: [string, any, Record<string, any>][] = deepFreeze([
+  [
+    'thread.started event',
+    { type: 'thread.started', thread_id: 'test-123' },
+    { type: 'init', agent: 'codex', session_id: 'test-123' },
+  ],
+  [
+    'turn.started event',
+    { type: 'turn.started' },
+    { type: 'turn_start', agent: 'codex' },
+  ],
+  [
+    'agent_message item',
+    { type: 'item.completed', item: { type: 'agent_message', text: "Hello, I'm working on this task." } },
+    { type: 'message', agent: 'codex', content: "Hello, I'm working on this task.", complete: true },
+  ],
+  [
+    'file write tool call',
+    { type: 'item.completed', item: { type: 'tool_call', name: 'write_file', arguments: { path: 'src/auth.ts', content: '...' } } },
+    { type: 'file_write', agent: 'codex', tool: 'write_file', path: 'src/auth.ts' },
+  ],
+  [
+    'file read tool call',
+    { type: 'item.completed', item: { type: 'tool_call', name: 'read_file', arguments: { path: 'src/auth.ts' } } },
+    { type: 'file_read', path: 'src/auth.ts' },
+  ],
+  [
+    'bash tool call',
+    { type: 'item.completed', item: { type: 'tool_call', name: 'shell', arguments: { command: 'npm install' } } },
+    { type: 'bash', tool: 'shell', command: 'npm install' },
+  ],
+  [
+    'turn.completed event',
+    { type: 'turn.completed', usage: { input_tokens: 100, output_tokens: 50 } },
+    { type: 'result', agent: 'codex', status: 'success', usage: { input_tokens: 100, output_tokens: 50 } },
+  ],
+  [
+    'unknown tool call',
+    { type: 'item.completed', item: { type: 'tool_call', name: 'custom_tool', arguments: { arg1: 'value1' } } },
+    { type: 'tool_use', tool: 'custom_tool', args: { arg1: 'value1' } },
+  ],
+]);
 
-  test('should normalize turn.completed event', () => {
-    const raw = {
-      type: 'turn.completed',
-      usage: { input_tokens: 100, output_tokens: 50 },
-    };
-    const event = normalizeEvent('codex', raw);
-
-    expect(event.type).toBe('result');
-    expect(event.agent).toBe('codex');
-    expect(event.status).toBe('success');
-    expect(event.usage.input_tokens).toBe(100);
-    expect(event.usage.output_tokens).toBe(50);
-  });
-
-  test('should normalize unknown tool call', () => {
-    const raw = {
-      type: 'item.completed',
-      item: {
-        type: 'tool_call',
-        name: 'custom_tool',
-        arguments: { arg1: 'value1' },
-      },
-    };
-    const event = normalizeEvent('codex', raw);
+describe('Codex Parser', () => {
+  for (const [name, raw, expected] of CODEX_CASES) {
+    test(`should normalize ${name}`, () => {
+      const event = normalizeEvent('codex', raw);
 
-    expect(event.type).toBe('tool_use');
-    expect(event.tool).toBe('custom_tool');
-    expect(event.args).toEqual({ arg1: 'value1' });
-  });
+      for (const [key, value] of Object.entries(expected)) {
+        expect(event[key]).toEqual(value);
+      }
+      expect(event.timestamp).toBeDefined();
+    });
+  }
 });
 
 describe('Cursor Parser', () => {
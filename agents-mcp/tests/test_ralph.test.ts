@@ -1,6 +1,6 @@
 /**
  * Unit tests for ralph mode utilities.
- * Tests getRalphConfig(), isDangerousPath(), and buildRalphPrompt().
+ * Tests getRalphConfig(), isDangerousPath(), resolveRalphCwd(), and buildRalphPrompt().
  */
 
 import { describe, test, expect, beforeEach, afterEach } from 'bun:test';
@@ -8,7 +8,7 @@ import * as fs from 'fs/promises';
 import * as path from 'path';
 import * as os from 'os';
 import { tmpdir } from 'os';
-import { getRalphConfig, isDangerousPath, buildRalphPrompt } from '../src/ralph.js';
+import { getRalphConfig, isDangerousPath, resolveRalphCwd, buildRalphPrompt } from '../src/ralph.js';
 
 describe('Ralph Mode Utilities', () => {
   describe('getRalphConfig', () => {
@@ -163,6 +163,22 @@ describe('Ralph Mode Utilities', () => {
     });
   });
 
+  describe('resolveRalphCwd', () => {
+    test('should require a cwd', () => {
+      expect(() => resolveRalphCwd(null)).toThrow('requires a cwd');
+      expect(() => resolveRalphCwd('')).toThrow('requires a cwd');
+    });
+
+    test('should reject home and system directories', () => {
+      expect(() => resolveRalphCwd(os.homedir())).toThrow('risky');
+      expect(() => resolveRalphCwd('/System/Library')).toThrow('risky');
+    });
+
+    test('should return the resolved path for a project directory', () => {
+      expect(resolveRalphCwd('/tmp/my-project/./src/..')).toBe('/tmp/my-project');
+    });
+  });
+
   describe('buildRalphPrompt', () => {
     let testDir: string;
     let ralphFilePath: string;
@@ -1,4 +1,4 @@
-import { describe, test, expect, beforeEach, afterEach } from 'bun:test';
+import { describe, test, expect, beforeAll, afterAll, beforeEach } from 'bun:test';
 import * as fs from 'fs/promises';
 import * as path from 'path';
 import { tmpdir } from 'os';
@@ -9,57 +9,43 @@ import {
 } from '../src/agents.js';
 import { summarizeEvents, getQuickStatus } from '../src/summarizer.js';
 import { getParentSessionIdFromEnv } from '../src/server.js';
+import type { AgentType } from '../src/parsers.js';
+
+/** An in-memory plan-mode agent for seeding the manager; nothing is written to disk. */
+function taskAgent(
+  agentId: string,
+  taskName: string,
+  agentType: AgentType,
+  prompt: string,
+  status: AgentStatus
+): AgentProcess {
+  return new AgentProcess(agentId, taskName, agentType, prompt, null, 'plan', null, status);
+}
 
 describe('Task-Based API', () => {
   let manager: AgentManager;
   let testDir: string;
 
-  beforeEach(async () => {
-    testDir = path.join(tmpdir(), `server_api_tests_${Date.now()}`);
-    await fs.mkdir(testDir, { recursive: true });
+  // Agents are seeded in memory only, so one manager and directory serve every test
+  beforeAll(async () => {
+    testDir = await fs.mkdtemp(path.join(tmpdir(), 'server_api_tests_'));
     manager = new AgentManager(50, 10, testDir);
     await manager['initialize']();
-    manager['agents'].clear();
   });
 
-  afterEach(async () => {
-    try {
-      await fs.rm(testDir, { recursive: true });
-    } catch {}
+  afterAll(async () => {
+    await fs.rm(testDir, { recursive: true, force: true });
+  });
+
+  beforeEach(() => {
+    manager['agents'].clear();
   });
 
   describe('spawn - multiple agents same task', () => {
     test('should allow spawning multiple agents under same task name', async () => {
-      const agent1 = new AgentProcess(
-        'agent-1',
-        'feature-auth',
-        'codex',
-        'Implement login',
-        null,
-        'plan',
-        null,
-        AgentStatus.RUNNING
-      );
-      const agent2 = new AgentProcess(
-        'agent-2',
-        'feature-auth',
-        'cursor',
-        'Fix auth bug',
-        null,
-        'plan',
-        null,
-        AgentStatus.RUNNING
-      );
-      const agent3 = new AgentProcess(
-        'agent-3',
-        'feature-auth',
-        'gemini',
-        'Refactor auth module',
-        null,
-        'plan',
-        null,
-        AgentStatus.RUNNING
-      );
+      const agent1 = taskAgent('agent-1', 'feature-auth', 'codex', 'Implement login', AgentStatus.RUNNING);
+      const agent2 = taskAgent('agent-2', 'feature-auth', 'cursor', 'Fix auth bug', AgentStatus.RUNNING);
+      const agent3 = taskAgent('agent-3', 'feature-auth', 'gemini', 'Refactor auth module', AgentStatus.RUNNING);
 
       manager['agents'].set('agent-1', agent1);
       manager['agents'].set('agent-2', agent2);
@@ -71,9 +57,9 @@ describe('Task-Based API', () => {
     });
 
     test('should isolate agents by task name', async () => {
-      const agent1 = new AgentProcess('a1', 'task-a', 'codex', 'Task A work', null, 'plan', null, AgentStatus.RUNNING);
-      const agent2 = new AgentProcess('a2', 'task-a', 'cursor', 'Task A debug', null, 'plan', null, AgentStatus.RUNNING);
-      const agent3 = new AgentProcess('b1', 'task-b', 'codex', 'Task B work', null, 'plan', null, AgentStatus.RUNNING);
+      const agent1 = taskAgent('a1', 'task-a', 'codex', 'Task A work', AgentStatus.RUNNING);
+      const agent2 = taskAgent('a2', 'task-a', 'cursor', 'Task A debug', AgentStatus.RUNNING);
+      const agent3 = taskAgent('b1', 'task-b', 'codex', 'Task B work', AgentStatus.RUNNING);
 
       manager['agents'].set('a1', agent1);
       manager['agents'].set('a2', agent2);
@@ -115,10 +101,10 @@ describe('Task-Based API', () => {
     });
 
     test('should count status correctly across multiple agents', async () => {
-      const agent1 = new AgentProcess('a1', 'my-task', 'codex', 'Work 1', null, 'plan', null, AgentStatus.RUNNING);
-      const agent2 = new AgentProcess('a2', 'my-task', 'cursor', 'Work 2', null, 'plan', null, AgentStatus.COMPLETED);
-      const agent3 = new AgentProcess('a3', 'my-task', 'gemini', 'Work 3', null, 'plan', null, AgentStatus.FAILED);
-      const agent4 = new AgentProcess('a4', 'my-task', 'claude', 'Work 4', null, 'plan', null, AgentStatus.STOPPED);
+      const agent1 = taskAgent('a1', 'my-task', 'codex', 'Work 1', AgentStatus.RUNNING);
+      const agent2 = taskAgent('a2', 'my-task', 'cursor', 'Work 2', AgentStatus.COMPLETED);
+      const agent3 = taskAgent('a3', 'my-task', 'gemini', 'Work 3', AgentStatus.FAILED);
+      const agent4 = taskAgent('a4', 'my-task', 'claude', 'Work 4', AgentStatus.STOPPED);
 
       manager['agents'].set('a1', agent1);
       manager['agents'].set('a2', agent2);
@@ -162,7 +148,7 @@ describe('Task-Based API', () => {
     });
 
     test('should verify agent belongs to task before returning status', async () => {
-      const agent = new AgentProcess('agent-1', 'task-a', 'codex', 'Work', null, 'plan', null, AgentStatus.RUNNING);
+      const agent = taskAgent('agent-1', 'task-a', 'codex', 'Work', AgentStatus.RUNNING);
       manager['agents'].set('agent-1', agent);
 
       const retrieved = await manager.get('agent-1');
@@ -178,9 +164,9 @@ describe('Task-Based API', () => {
 
   describe('stop - task level', () => {
     test('should stop all running agents in task', async () => {
-      const agent1 = new AgentProcess('a1', 'stop-task', 'codex', 'Work 1', null, 'plan', null, AgentStatus.RUNNING);
-      const agent2 = new AgentProcess('a2', 'stop-task', 'cursor', 'Work 2', null, 'plan', null, AgentStatus.RUNNING);
-      const agent3 = new AgentProcess('a3', 'stop-task', 'gemini', 'Work 3', null, 'plan', null, AgentStatus.COMPLETED);
+      const agent1 = taskAgent('a1', 'stop-task', 'codex', 'Work 1', AgentStatus.RUNNING);
+      const agent2 = taskAgent('a2', 'stop-task', 'cursor', 'Work 2', AgentStatus.RUNNING);
+      const agent3 = taskAgent('a3', 'stop-task', 'gemini', 'Work 3', AgentStatus.COMPLETED);
 
       manager['agents'].set('a1', agent1);
       manager['agents'].set('a2', agent2);
@@ -194,8 +180,8 @@ describe('Task-Based API', () => {
     });
 
     test('should not affect agents in other tasks', async () => {
-      const agent1 = new AgentProcess('a1', 'task-to-stop', 'codex', 'Work', null, 'plan', null, AgentStatus.RUNNING);
-      const agent2 = new AgentProcess('a2', 'other-task', 'cursor', 'Work', null, 'plan', null, AgentStatus.RUNNING);
+      const agent1 = taskAgent('a1', 'task-to-stop', 'codex', 'Work', AgentStatus.RUNNING);
+      const agent2 = taskAgent('a2', 'other-task', 'cursor', 'Work', AgentStatus.RUNNING);
 
       manager['agents'].set('a1', agent1);
       manager['agents'].set('a2', agent2);
@@ -209,7 +195,7 @@ describe('Task-Based API', () => {
 
   describe('stop - agent level', () => {
     test('should verify agent belongs to task before stopping', async () => {
-      const agent = new AgentProcess('agent-1', 'task-a', 'codex', 'Work', null, 'plan', null, AgentStatus.RUNNING);
+      const agent = taskAgent('agent-1', 'task-a', 'codex', 'Work', AgentStatus.RUNNING);
       manager['agents'].set('agent-1', agent);
 
       const retrieved = await manager.get('agent-1');
@@ -221,7 +207,7 @@ describe('Task-Based API', () => {
     });
 
     test('should return already_stopped for completed agent', async () => {
-      const agent = new AgentProcess('agent-1', 'my-task', 'codex', 'Work', null, 'plan', null, AgentStatus.COMPLETED);
+      const agent = taskAgent('agent-1', 'my-task', 'codex', 'Work', AgentStatus.COMPLETED);
       manager['agents'].set('agent-1', agent);
 
       const success = await manager.stop('agent-1');
@@ -283,8 +269,8 @@ describe('Task-Based API', () => {
     });
 
     test('should handle task with no running agents', async () => {
-      const agent1 = new AgentProcess('a1', 'done-task', 'codex', 'Work 1', null, 'plan', null, AgentStatus.COMPLETED);
-      const agent2 = new AgentProcess('a2', 'done-task', 'cursor', 'Work 2', null, 'plan', null, AgentStatus.FAILED);
+      const agent1 = taskAgent('a1', 'done-task', 'codex', 'Work 1', AgentStatus.COMPLETED);
+      const agent2 = taskAgent('a2', 'done-task', 'cursor', 'Work 2', AgentStatus.FAILED);
 
       manager['agents'].set('a1', agent1);
       manager['agents'].set('a2', agent2);
@@ -168,6 +168,14 @@ describe('SummarizeEvents', () => {
     expect(summary.duration).toBe('7.5 seconds');
   });
 
+  test('should format long durations in minutes', () => {
+    const events = [{ type: 'result', status: 'success', duration_ms: 125000, timestamp: '2024-01-01' }];
+
+    const summary = summarizeEvents('test-6b', 'codex', 'completed', events, null);
+
+    expect(summary.duration).toBe('2.1 minutes');
+  });
+
   test('should track event count', () => {
     const events = Array(10).fill({ type: 'init', timestamp: '2024-01-01' });
 
@@ -175,6 +183,23 @@ describe('SummarizeEvents', () => {
 
     expect(summary.eventCount).toBe(10);
   });
+
+  test('should summarize a streamed iterable like an array', () => {
+    const events = [
+      { type: 'bash', command: 'cat README.md', timestamp: '2024-01-01' },
+      { type: 'file_write', path: 'src/auth.ts', timestamp: '2024-01-01' },
+      { type: 'message', content: 'Updated auth', timestamp: '2024-01-01' },
+      { type: 'result', status: 'success', duration_ms: 3000, timestamp: '2024-01-01' },
+    ];
+    function* stream() {
+      yield* events;
+    }
+
+    const streamed = summarizeEvents('test-8', 'codex', 'completed', stream());
+    const listed = summarizeEvents('test-8', 'codex', 'completed', events);
+
+    expect(streamed.toDict('detailed')).toEqual(listed.toDict('detailed'));
+  });
 });
 
 describe('SummaryToDict', () => {
@@ -293,6 +318,107 @@ describe('GetDelta', () => {
 
     expect(delta.latest_message).toBe('Working on it...');
   });
+
+  test('should reuse delta until new events arrive', () => {
+    const events: any[] = [
+      { type: 'file_write', path: 'src/auth.ts', timestamp: '2024-01-01' },
+    ];
+
+    const first = getDelta('test-14', 'codex', 'running', events);
+    expect(getDelta('test-14', 'codex', 'running', events)).toBe(first);
+    expect(Object.isFrozen(first)).toBe(true);
+    expect(Object.isFrozen(first.new_files_modified)).toBe(true);
+
+    events.push({ type: 'file_write', path: 'src/types.ts', timestamp: '2024-01-01' });
+    const second = getDelta('test-14', 'codex', 'running', events);
+
+    expect(second).not.toBe(first);
+    expect(second.new_files_modified).toEqual(['src/auth.ts', 'src/types.ts']);
+    expect(getDelta('test-14', 'codex', 'completed', events)).not.toBe(second);
+  });
+
+  test('should fold appended events into the cached delta', () => {
+    const since = '2024-01-01T00:00:00Z';
+    const events: any[] = [
+      { type: 'file_write', path: 'src/old.ts', timestamp: '2023-12-31T23:00:00Z' },
+      { type: 'bash', command: 'npm test', timestamp: '2024-01-01T00:01:00Z' },
+      { type: 'message', content: 'Running tests', timestamp: '2024-01-01T00:02:00Z' },
+    ];
+
+    const first = getDelta('test-15', 'codex', 'running', events, since);
+    expect(first.new_events_count).toBe(2);
+
+    events.push(
+      { type: 'file_write', path: 'src/new.ts', timestamp: '2024-01-01T00:03:00Z' },
+      { type: 'message', content: 'Done', timestamp: '2024-01-01T00:04:00Z' },
+    );
+    const second = getDelta('test-15', 'codex', 'completed', events, since);
+
+    expect(second.status).toBe('completed');
+    expect(second.new_events_count).toBe(4);
+    expect(second.new_files_modified).toEqual(['src/new.ts']);
+    expect(second.new_bash_commands).toEqual(['npm test']);
+    expect(second.new_tool_count).toBe(2);
+    expect(second.latest_message).toBe('Done');
+    expect(first.new_files_modified).toEqual([]);
+  });
+
+  test('should match a full recompute at every split of the event list', () => {
+    // A message-less error falls back to the raw tail of all events seen so far, which
+    // later events push out of range
+    const events: any[] = [
+      { type: 'raw', content: 'Error: connection refused', timestamp: '2024-01-01T00:00:01Z' },
+      { type: 'error', timestamp: '2024-01-01T00:00:02Z' },
+      ...Array.from({ length: 25 }, (_, i) => ({ type: 'bash', command: `step ${i}`, timestamp: '2024-01-01T00:01:00Z' })),
+      { type: 'result', status: 'error', timestamp: '2024-01-01T00:02:00Z' },
+      { type: 'message', content: 'Gave up', timestamp: '2024-01-01T00:03:00Z' },
+    ];
+
+    for (const since of [undefined, 0, 5, '2024-01-01T00:00:00Z', '2024-01-01T00:01:30Z']) {
+      const full = getDelta('test-16', 'codex', 'failed', events.slice(), since);
+      for (let split = 0; split <= events.length; split++) {
+        const growing = events.slice(0, split);
+        getDelta('test-16', 'codex', 'running', growing, since);
+        growing.push(...events.slice(split));
+        expect(getDelta('test-16', 'codex', 'failed', growing, since)).toEqual(full);
+      }
+    }
+  });
+
+  test('should return only events after an advancing timestamp cursor', () => {
+    const events: any[] = [];
+    let cursor = new Date(0).toISOString();
+    for (let minute = 1; minute <= 3; minute++) {
+      const timestamp = `2024-01-01T00:0${minute}:00Z`;
+      events.push(
+        { type: 'file_write', path: `src/step${minute}.ts`, timestamp },
+        { type: 'message', content: `Step ${minute}`, timestamp },
+      );
+
+      const delta = getDelta('test-17', 'codex', 'running', events, cursor);
+      expect(delta.new_events_count).toBe(2);
+      expect(delta.new_files_modified).toEqual([`src/step${minute}.ts`]);
+      expect(delta.new_messages).toEqual([`Step ${minute}`]);
+      cursor = timestamp;
+    }
+  });
+
+  test('should filter out-of-order timestamps like a full scan', () => {
+    const since = '2024-01-01T00:02:00Z';
+    const events: any[] = [
+      { type: 'file_write', path: 'src/late.ts', timestamp: '2024-01-01T00:03:00Z' },
+      { type: 'file_write', path: 'src/early.ts', timestamp: '2024-01-01T00:01:00Z' },
+      { type: 'bash', command: 'npm test' },
+    ];
+
+    const first = getDelta('test-18', 'codex', 'running', events, since);
+    expect(first.new_files_modified).toEqual(['src/late.ts']);
+
+    events.push({ type: 'file_write', path: 'src/new.ts', timestamp: '2024-01-01T00:04:00Z' });
+    const second = getDelta('test-18', 'codex', 'running', events, since);
+    expect(second.new_events_count).toBe(2);
+    expect(second.new_files_modified).toEqual(['src/late.ts', 'src/new.ts']);
+  });
 });
 
 describe('EventPriorityFiltering', () => {
@@ -329,6 +455,19 @@ describe('EventPriorityFiltering', () => {
     expect(filtered.some(e => e.type === 'thinking')).toBe(true);
     expect(filtered.some(e => e.type === 'init')).toBe(false);
   });
+
+  test('should default to critical and important events', () => {
+    const events = [
+      { type: 'raw', content: 'noise', timestamp: '2024-01-01' },
+      { type: 'result', status: 'success', timestamp: '2024-01-01' },
+      { type: 'bash', command: 'ls', timestamp: '2024-01-01' },
+      { type: 'mystery', timestamp: '2024-01-01' },
+    ];
+
+    const filtered = filterEventsByPriority(events);
+
+    expect(filtered.map(e => e.type)).toEqual(['result', 'bash']);
+  });
 });
 
 describe('GetQuickStatus', () => {
@@ -9,69 +9,106 @@ Shows a clean, readable permission dialog with:
 - Deny/Allow buttons
 """
 
-import glob
 import json
 import os
-import subprocess
 import sys
 from pathlib import Path
-from urllib.parse import urlparse
 
 
 def get_first_message(session_id: str) -> str:
     """Look up the first user message from the session file."""
     base = Path.home() / ".claude" / "projects"
-    for session_file in glob.glob(str(base / "*" / f"{session_id}.jsonl")):
-        try:
-            with open(session_file) as f:
-                for line in f:
-                    try:
-                        rec = json.loads(line)
-                        if rec.get("type") == "user":
-                            msg = rec.get("message", {}).get("content", "")
-                            if msg:
-                                return msg[:60] + "..." if len(msg) > 60 else msg
-                    except json.JSONDecodeError:
-                        continue
-        except (IOError, OSError):
-            continue
+    try:
+        project_dirs = os.scandir(base)
+    except OSError:
+        return "Unknown session"
+
+    # Probe each project for the session file directly and stop at the first hit,
+    # rather than globbing every project up front.
+    with project_dirs:
+        for entry in project_dirs:
+            session_file = os.path.join(entry.path, f"{session_id}.jsonl")
+            try:
+                with open(session_file) as f:
+                    for line in f:
+                        try:
+                            rec = json.loads(line)
+                            if rec.get("type") == "user":
+                                msg = rec.get("message", {}).get("content", "")
+                                if msg:
+                                    return msg[:60] + "..." if len(msg) > 60 else msg
+                        except json.JSONDecodeError:
+                            continue
+            except (IOError, OSError):
+                continue
     return "Unknown session"
 
 
+def url_netloc(url: str) -> str:
+    """Return the host part of a URL, or its first 40 chars if it has no scheme."""
+    start = url.find("://")
+    if start < 0:
+        return url[:40]
+    start += 3
+    end = len(url)
+    for sep in "/?#":
+        idx = url.find(sep, start, end)
+        if idx != -1:
+            end = idx
+    return url[start:end]
+
+
+def summarize_edit(tool_input: dict) -> str:
+    """Summarize an Edit call as the file name and old -> new lengths."""
+    basename = Path(tool_input.get("file_path", "unknown")).name
+    old_len = len(tool_input.get("old_string", ""))
+    new_len = len(tool_input.get("new_string", ""))
+    return f"Edit {basename}\n{old_len} -> {new_len} chars"
+
+
+def summarize_write(tool_input: dict) -> str:
+    """Summarize a Write call as the file name and content size."""
+    basename = Path(tool_input.get("file_path", "unknown")).name
+    content_len = len(tool_input.get("content", ""))
+    return f"Write {basename}\n{content_len} bytes"
+
+
+def summarize_read(tool_input: dict) -> str:
+    """Summarize a Read call as the file name."""
+    basename = Path(tool_input.get("file_path", "unknown")).name
+    return f"Read {basename}"
+
+
+def summarize_bash(tool_input: dict) -> str:
+    """Summarize a Bash call as its command, truncated to 80 chars."""
+    command = tool_input.get("command", "")
+    truncated = command[:80] + "..." if len(command) > 80 else command
+    return f"$ {truncated}"
+
+
+def summarize_webfetch(tool_input: dict) -> str:
+    """Summarize a WebFetch call as the host being fetched."""
+    url = tool_input.get("url", "unknown")
+    return f"Fetch {url_netloc(url)}"
+
+
+# Tool name -> summary builder used by generate_summary
+SUMMARIZERS = {
+    "Edit": summarize_edit,
+    "Write": summarize_write,
+    "Read": summarize_read,
+    "Bash": summarize_bash,
+    "WebFetch": summarize_webfetch,
+}
+
+
 def generate_summary(tool_name: str, tool_input: dict) -> str:
     """Generate a human-readable summary based on tool type."""
-    if tool_name == "Edit":
-        file_path = tool_input.get("file_path", "unknown")
-        basename = Path(file_path).name
-        old_len = len(tool_input.get("old_string", ""))
-        new_len = len(tool_input.get("new_string", ""))
-        return f"Edit {basename}\n{old_len} -> {new_len} chars"
-
-    elif tool_name == "Write":
-        file_path = tool_input.get("file_path", "unknown")
-        basename = Path(file_path).name
-        content_len = len(tool_input.get("content", ""))
-        return f"Write {basename}\n{content_len} bytes"
-
-    elif tool_name == "Read":
-        file_path = tool_input.get("file_path", "unknown")
-        basename = Path(file_path).name
-        return f"Read {basename}"
-
-    elif tool_name == "Bash":
-        command = tool_input.get("command", "")
-        truncated = command[:80] + "..." if len(command) > 80 else command
-        return f"$ {truncated}"
-
-    elif tool_name == "WebFetch":
-        url = tool_input.get("url", "unknown")
-        try:
-            domain = urlparse(url).netloc
-        except Exception:
-            domain = url[:40]
-        return f"Fetch {domain}"
+    summarize = SUMMARIZERS.get(tool_name)
+    if summarize:
+        return summarize(tool_input)
 
-    elif tool_name.startswith("mcp__"):
+    if tool_name.startswith("mcp__"):
         parts = tool_name.split("__")
         if len(parts) >= 3:
             server = parts[1]
@@ -79,49 +116,58 @@ def generate_summary(tool_name: str, tool_input: dict) -> str:
             return f"MCP: {server} -> {tool}"
         return f"MCP: {tool_name}"
 
-    else:
-        # Generic fallback
-        return f"{tool_name}"
+    # Generic fallback
+    return f"{tool_name}"
 
 
-def show_dialog(session_context: str, tool_summary: str) -> str:
-    """Show AppleScript dialog and return user choice."""
-    icon_path = Path.home() / ".claude" / "assets" / "claude-icon.icns"
-
-    # Escape for AppleScript: replace quotes and remove newlines
-    session_clean = session_context.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
-    summary_clean = tool_summary.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " | ")
-
-    # display alert doesn't support custom icons, so use display dialog with icon file
-    # if we have a custom icon, otherwise use display alert for larger text
-    if icon_path.exists():
-        # Use display dialog with custom icon
-        applescript = f"""
-set sessionLine to "{session_clean}"
-set summaryLine to "{summary_clean}"
-set fullText to sessionLine & return & return & summaryLine
-try
-    set btnResult to button returned of (display dialog fullText buttons {{"Deny", "Allow"}} default button "Allow" with title "Claude Permission" with icon file (POSIX file "{icon_path}"))
-    return btnResult
-on error
-    return "Deny"
-end try
+ICON_PATH = Path.home() / ".claude" / "assets" / "claude-icon.icns"
+HAS_ICON = ICON_PATH.exists()
+
+# Static scripts: values arrive through `on run argv`, so user text never needs AppleScript escaping.
+# display alert doesn't support custom icons, so use display dialog with icon file
+# if we have a custom icon, otherwise use display alert for larger text
+DIALOG_SCRIPT = """
+on run argv
+    set fullText to (item 1 of argv) & return & return & (item 2 of argv)
+    try
+        set btnResult to button returned of (display dialog fullText buttons {"Deny", "Allow"} default button "Allow" with title "Claude Permission" with icon file (POSIX file (item 3 of argv)))
+        return btnResult
+    on error
+        return "Deny"
+    end try
+end run
 """
-    else:
-        # Use display alert (larger text, no custom icon)
-        applescript = f"""
-set sessionLine to "{session_clean}"
-set summaryLine to "{summary_clean}"
-try
-    set btnResult to button returned of (display alert sessionLine message summaryLine buttons {{"Deny", "Allow"}} default button "Allow")
-    return btnResult
-on error
-    return "Deny"
-end try
+
+ALERT_SCRIPT = """
+on run argv
+    try
+        set btnResult to button returned of (display alert (item 1 of argv) message (item 2 of argv) buttons {"Deny", "Allow"} default button "Allow")
+        return btnResult
+    on error
+        return "Deny"
+    end try
+end run
 """
 
+
+def build_osascript_command(session_context: str, tool_summary: str) -> list:
+    """Build the osascript argv for the permission dialog."""
+    session_line = session_context.replace("\n", " ")
+    summary_line = tool_summary.replace("\n", " | ")
+    if HAS_ICON:
+        return ["osascript", "-e", DIALOG_SCRIPT, session_line, summary_line, str(ICON_PATH)]
+    return ["osascript", "-e", ALERT_SCRIPT, session_line, summary_line]
+
+
+def show_dialog(session_context: str, tool_summary: str) -> str:
+    """Show AppleScript dialog and return user choice."""
+    # Imported here so the deny-on-bad-input path in main() never loads subprocess
+    import subprocess
+
     try:
-        result = subprocess.run(["osascript", "-e", applescript], capture_output=True, text=True, timeout=60)
+        result = subprocess.run(
+            build_osascript_command(session_context, tool_summary), capture_output=True, text=True, timeout=60
+        )
         return result.stdout.strip()
     except subprocess.TimeoutExpired:
         return "Deny"
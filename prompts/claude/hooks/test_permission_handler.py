@@ -2,6 +2,7 @@
 """Tests for permission-handler.py"""
 
 import json
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -11,7 +12,13 @@ import pytest
 # Add the hooks directory to the path so we can import the module
 sys.path.insert(0, str(Path(__file__).parent))
 
-from permission_handler import generate_summary, get_first_message, show_dialog
+from permission_handler import (
+    ALERT_SCRIPT,
+    DIALOG_SCRIPT,
+    build_osascript_command,
+    generate_summary,
+    get_first_message,
+)
 
 
 class TestGenerateSummary:
@@ -68,6 +75,14 @@ class TestGenerateSummary:
         result = generate_summary("WebFetch", tool_input)
         assert result == "Fetch docs.anthropic.com"
 
+    def test_webfetch_summary_stops_at_query_and_fragment(self):
+        assert generate_summary("WebFetch", {"url": "https://example.com?q=1"}) == "Fetch example.com"
+        assert generate_summary("WebFetch", {"url": "http://localhost:8080#top"}) == "Fetch localhost:8080"
+
+    def test_webfetch_summary_without_scheme(self):
+        result = generate_summary("WebFetch", {"url": "example.com/path"})
+        assert result == "Fetch example.com/path"
+
     def test_mcp_summary(self):
         result = generate_summary("mcp__Swarm__spawn", {})
         assert result == "MCP: Swarm -> spawn"
@@ -98,52 +113,48 @@ class TestGetFirstMessage:
         result = get_first_message("test-session-123")
         assert isinstance(result, str)
 
+    def test_finds_message_in_project_dir(self, tmp_path, monkeypatch):
+        project_dir = tmp_path / ".claude" / "projects" / "some-project"
+        project_dir.mkdir(parents=True)
+        (tmp_path / ".claude" / "projects" / "other-project").mkdir()
+        shutil.copy(Path(__file__).parent / "testdata" / "test-session-123.jsonl", project_dir)
+        monkeypatch.setenv("HOME", str(tmp_path))
 
-class TestShowDialog:
-    """Tests for show_dialog AppleScript generation."""
+        result = get_first_message("test-session-123")
+        assert result == "Help me improve the notification experience for Claude"
 
-    def test_escapes_quotes_in_session_context(self):
-        # Test that quotes don't break the AppleScript
-        session = 'User said "hello" to me'
-        summary = "Edit file.py"
+    def test_returns_unknown_without_projects_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert get_first_message("test-session-123") == "Unknown session"
 
-        # We can't easily test the dialog itself, but we can verify
-        # the function doesn't crash with special characters
-        # In a real test, we'd need to capture the AppleScript string
-        # For now, just verify it handles the input
-        assert session.replace('"', '\\"') == 'User said \\"hello\\" to me'
 
-    def test_escapes_backslashes(self):
-        session = "Path is C:\\Users\\test"
-        escaped = session.replace("\\", "\\\\")
-        assert escaped == "Path is C:\\\\Users\\\\test"
+class TestShowDialog:
+    """Tests for the osascript command built by show_dialog."""
+
+    def test_passes_quotes_through_unescaped(self):
+        cmd = build_osascript_command('User said "hello" to me', "Edit file.py")
+        assert cmd[3] == 'User said "hello" to me'
+
+    def test_passes_backslashes_through_unescaped(self):
+        cmd = build_osascript_command("Path is C:\\Users\\test", "Edit file.py")
+        assert cmd[3] == "Path is C:\\Users\\test"
 
     def test_replaces_newlines(self):
-        session = "Line 1\nLine 2\nLine 3"
-        cleaned = session.replace("\n", " ")
-        assert cleaned == "Line 1 Line 2 Line 3"
+        cmd = build_osascript_command("Line 1\nLine 2\nLine 3", "Edit file.py\n10 -> 20 chars")
+        assert cmd[3] == "Line 1 Line 2 Line 3"
+        assert cmd[4] == "Edit file.py | 10 -> 20 chars"
+
+    def test_script_is_static(self):
+        cmd = build_osascript_command('"; do shell script "echo pwned', "Edit file.py")
+        assert cmd[2] in (DIALOG_SCRIPT, ALERT_SCRIPT)
 
 
 class TestAppleScriptGeneration:
     """Test that AppleScript is generated correctly."""
 
-    def test_applescript_syntax_valid(self):
-        """Verify the generated AppleScript has valid syntax."""
-        # Generate what the AppleScript would look like
-        session_clean = "Test session"
-        summary_clean = "Edit file.py | 10 -> 20 chars"
-        icon_clause = "with icon note"
-
-        applescript = f"""
-set sessionLine to "{session_clean}"
-set summaryLine to "{summary_clean}"
-try
-    set btnResult to button returned of (display alert sessionLine message summaryLine buttons {{"Deny", "Allow"}} default button "Allow" {icon_clause})
-    return btnResult
-on error
-    return "Deny"
-end try
-"""
+    @pytest.mark.parametrize("applescript", [DIALOG_SCRIPT, ALERT_SCRIPT], ids=["dialog", "alert"])
+    def test_applescript_syntax_valid(self, applescript):
+        """Verify the dialog scripts have valid syntax."""
         # Use osacompile to check syntax without running
         result = subprocess.run(
             ["osacompile", "-e", applescript, "-o", "/dev/null"],